@@ -0,0 +1,98 @@
+"""
+Vectorized analytics vs a row-wise baseline on synthetic top-tracks JSON.
+
+    python benchmarks/bench_analytics.py --artists 10000 --tracks 10
+"""
+import argparse
+import random
+import statistics
+import time
+from collections import Counter
+
+import pandas as pd
+
+from spotify_tool import analytics
+
+
+def synthetic_payloads(n_artists, n_tracks, seed=0):
+    rng = random.Random(seed)
+    payloads = {}
+    for a in range(n_artists):
+        artist_id = f"artist{a:06d}"
+        payloads[artist_id] = {"tracks": [{
+            "id": f"{artist_id}t{t}",
+            "name": f"Track {t}",
+            "popularity": rng.randint(0, 100),
+            "duration_ms": rng.randint(90_000, 420_000),
+            "album": {"id": f"{artist_id}al{rng.randint(0, 3)}", "name": f"Album {t % 4}"},
+        } for t in range(n_tracks)]}
+    return payloads
+
+
+def _quantile(sorted_vals, q):
+    # Linear interpolation, same as pandas' default
+    pos = (len(sorted_vals) - 1) * q
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (pos - lo)
+
+
+def rowwise_aggregates(payloads, percentiles=analytics.PERCENTILES):
+    """Baseline: the per-artist Python loop the analytics module replaces."""
+    rows = []
+    for artist_id, data in payloads.items():
+        tracks = data.get("tracks", [])
+        pops = sorted(t["popularity"] for t in tracks)
+        mins = [t["duration_ms"] / 60000 for t in tracks]
+        albums = Counter(t["album"]["id"] for t in tracks)
+        shares = [c / len(tracks) for c in albums.values()]
+        row = {"artist_id": artist_id, "tracks": len(tracks), "popularity_mean": statistics.fmean(pops)}
+        for q in percentiles:
+            row[f"popularity_p{int(round(q * 100))}"] = _quantile(pops, q)
+        row.update({
+            "duration_mean": statistics.fmean(mins),
+            "duration_median": statistics.median(mins),
+            "duration_std": statistics.stdev(mins) if len(mins) > 1 else float("nan"),
+            "duration_min": min(mins),
+            "duration_max": max(mins),
+            "albums": len(albums),
+            "top_album_share": max(shares),
+            "album_hhi": sum(s * s for s in shares),
+        })
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--artists", type=int, default=10_000)
+    parser.add_argument("--tracks", type=int, default=10)
+    args = parser.parse_args()
+
+    payloads = synthetic_payloads(args.artists, args.tracks)
+    print(f"{args.artists:,} artists x {args.tracks} tracks = {args.artists * args.tracks:,} rows")
+
+    t = time.perf_counter()
+    rows = rowwise_aggregates(payloads)
+    rowwise = time.perf_counter() - t
+
+    t = time.perf_counter()
+    frame = analytics.tracks_frame(payloads)
+    built = time.perf_counter() - t
+    t = time.perf_counter()
+    agg = analytics.artist_aggregates(frame)
+    vectorized = time.perf_counter() - t
+
+    # Same numbers either way, for every artist and column (durations are float32 in the frame)
+    expected = pd.DataFrame(rows).sort_values("artist_id", ignore_index=True)
+    got = agg[expected.columns].sort_values("artist_id", ignore_index=True)
+    pd.testing.assert_frame_equal(got, expected, check_dtype=False, rtol=1e-6)
+
+    total = built + vectorized
+    print(f"row-wise aggregates:   {rowwise:8.3f} s")
+    print(f"tracks_frame (build):  {built:8.3f} s")
+    print(f"artist_aggregates:     {vectorized:8.3f} s  ({rowwise / vectorized:.1f}x aggregation only)")
+    print(f"build + aggregates:    {total:8.3f} s  ({rowwise / total:.1f}x end to end)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Offline throughput/latency benchmark for SpotifyAPI and the services pipeline.
+
+    python benchmarks/bench_client.py --artists 500 --workers 16 --latency-ms 30 --rate-429 0.01
+
+Starts the replay server from mock_server.py and runs each scenario against
+it. For every scenario it reports requests/sec, p50/p95/p99 request
+latency, scheduler retries and peak traced Python memory. Use --json to
+save results and compare them between commits.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_server import MockSpotifyServer  # noqa: E402
+from spotify_tool import SpotifyAPI, services  # noqa: E402
+from spotify_tool.ratelimit import RequestScheduler  # noqa: E402
+
+
+def percentile(sorted_vals, q):
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(round(q * (len(sorted_vals) - 1))))]
+
+
+class TimedClient(SpotifyAPI):
+    """SpotifyAPI that records the wall time of every HTTP round trip."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+
+    def _send(self, method, url, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super()._send(method, url, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+
+def artist_ids(n):
+    return [f"{i:06d}Bench{i:011d}"[:22] for i in range(n)]
+
+
+# Scenarios: each takes (api, ids, args) and does one unit of work
+def scenario_top_tracks_serial(api, ids, args):
+    for artist_id in ids:
+        api.get_artist_top_tracks(artist_id)
+
+
+def scenario_top_tracks_parallel(api, ids, args):
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(lambda a: services.build_top_tracks_df(api, a), ids))
+
+
+def scenario_comparison(api, ids, args):
+    df = services.build_comparison_df(api, [{"id": i} for i in ids])
+    services.sort_comparison_df(df)
+
+
+def scenario_roster_workbook(api, ids, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        services.write_roster_workbook(api, ids, os.path.join(tmp, "roster.xlsx"),
+                                       max_workers=args.workers)
+
+
+SCENARIOS = {
+    "top_tracks_serial": scenario_top_tracks_serial,
+    "top_tracks_parallel": scenario_top_tracks_parallel,
+    "comparison": scenario_comparison,
+    "roster_workbook": scenario_roster_workbook,
+}
+
+
+def run(name, server, args):
+    api = TimedClient("bench", "bench", api_base=server.api_base, token_url=server.token_url,
+                      pool_maxsize=args.workers,
+                      scheduler=RequestScheduler(rate=args.rate, burst=args.workers * 2,
+                                                 backoff_base=0.05))
+    ids = artist_ids(args.artists)
+    api._get_spotify_token()
+    api.latencies.clear()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        SCENARIOS[name](api, ids, args)
+    finally:
+        wall = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    lat = sorted(api.latencies)
+    sched = api.scheduler.stats()
+    conns = api.connection_stats()
+    api.close()
+    return {
+        "scenario": name,
+        "requests": len(lat),
+        "wall_s": round(wall, 3),
+        "req_per_s": round(len(lat) / wall, 1) if wall else 0.0,
+        "p50_ms": round(percentile(lat, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(lat, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(lat, 0.99) * 1000, 2),
+        "retries": sched["retries"],
+        "connections": conns["connections_opened"],
+        "peak_mem_mb": round(peak / 1e6, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline SpotifyAPI benchmark.")
+    parser.add_argument("--artists", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate", type=float, default=None,
+                        help="client token-bucket rate (req/s); default unthrottled")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="run only these (repeatable)")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    server = MockSpotifyServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                               rate_429=args.rate_429, retry_after=0, error_rate=args.error_rate)
+    results = []
+    with server:
+        for name in args.scenario or list(SCENARIOS):
+            results.append(run(name, server, args))
+
+    header = f"{'scenario':<22}{'reqs':>7}{'wall s':>9}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}" \
+             f"{'p99 ms':>9}{'retries':>9}{'conns':>7}{'peak MB':>9}"
+    print(header)
+    for r in results:
+        print(f"{r['scenario']:<22}{r['requests']:>7}{r['wall_s']:>9}{r['req_per_s']:>9}{r['p50_ms']:>9}"
+              f"{r['p95_ms']:>9}{r['p99_ms']:>9}{r['retries']:>9}{r['connections']:>7}{r['peak_mem_mb']:>9}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump({"args": vars(args), "results": results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
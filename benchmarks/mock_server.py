@@ -0,0 +1,218 @@
+"""
+Local stand-in for the Spotify Web API that replays recorded responses.
+
+    python benchmarks/mock_server.py --port 8765 --latency-ms 40 --rate-429 0.02
+
+Serves POST /api/token, GET /v1/search, /v1/artists, /v1/artists/{id} and
+/v1/artists/{id}/top-tracks from the JSON files in --fixtures (token.json,
+search.json, artist.json, top_tracks.json). The artist and top-track
+recordings are used as templates: the requested artist ID is substituted in.
+Point a client at it with SpotifyAPI(..., api_base=server.api_base,
+token_url=server.token_url).
+
+record_fixtures() captures fresh recordings from the real API.
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_fixtures(directory: str = FIXTURES) -> dict:
+    out = {}
+    for name in ("token", "search", "artist", "top_tracks"):
+        with open(os.path.join(directory, f"{name}.json"), encoding="utf-8") as fh:
+            out[name] = json.load(fh)
+    return out
+
+
+def record_fixtures(api, artist_id: str, query: str, directory: str = FIXTURES):
+    """Save real responses (needs credentials) as the server's templates."""
+    os.makedirs(directory, exist_ok=True)
+    recordings = {
+        "token": {"access_token": "recorded", "token_type": "Bearer", "expires_in": 3600},
+        "search": api.search_artists_raw(query, limit=5),
+        "artist": api.get(f"{api.API_BASE}/artists/{artist_id}"),
+        "top_tracks": api.get_artist_top_tracks(artist_id),
+    }
+    for name, body in recordings.items():
+        with open(os.path.join(directory, f"{name}.json"), "w", encoding="utf-8") as fh:
+            json.dump(body, fh, indent=1)
+
+
+class MockSpotifyServer:
+    """
+    Threaded replay server with injected latency, 429s and 5xx errors.
+
+    latency_ms / jitter_ms: added to every API response (not the token call).
+    rate_429:   fraction of requests answered 429 with Retry-After: retry_after.
+    error_rate: fraction of requests answered 503.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, fixtures=FIXTURES, latency_ms=0.0,
+                 jitter_ms=0.0, rate_429=0.0, retry_after=1, error_rate=0.0, seed=0):
+        self.fixtures = load_fixtures(fixtures)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.counts = {"requests": 0, "token": 0, "429": 0, "503": 0}
+        self._encoded = {}
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def api_base(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def token_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api/token"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # Responses
+    def _roll(self):
+        """-> (delay seconds, 429 roll, error roll) from the shared seeded RNG."""
+        with self._rng_lock:
+            delay = (self.latency_ms + self._rng.uniform(0, self.jitter_ms)) / 1000
+            return delay, self._rng.random(), self._rng.random()
+
+    def _count(self, key):
+        with self._rng_lock:
+            self.counts[key] += 1
+
+    def _artist(self, artist_id):
+        body = copy.deepcopy(self.fixtures["artist"])
+        body["id"] = artist_id
+        body["uri"] = f"spotify:artist:{artist_id}"
+        body["name"] = f"{body.get('name', 'Artist')} {artist_id[:6]}"
+        body.setdefault("followers", {})["total"] = sum(map(ord, artist_id)) * 997
+        body["popularity"] = sum(map(ord, artist_id)) % 101
+        return body
+
+    def _top_tracks(self, artist_id):
+        # Same template for every artist; encode once and substitute the ID
+        template = self._encoded.get("top_tracks")
+        if template is None:
+            template = self._encoded["top_tracks"] = json.dumps(self.fixtures["top_tracks"])
+        first = (self.fixtures["top_tracks"].get("tracks") or [{}])[0]
+        owner = ((first.get("artists") or [{}])[0]).get("id")
+        return template.replace(owner, artist_id) if owner else template
+
+    def route(self, method, path, query):
+        """-> (status, body) where body is a dict or pre-encoded JSON string."""
+        if method == "POST":
+            return 200, self.fixtures["token"]
+        if path == "/v1/search":
+            return 200, self.fixtures["search"]
+        if path == "/v1/artists":
+            ids = (query.get("ids") or [""])[0].split(",")
+            return 200, {"artists": [self._artist(i) for i in ids if i]}
+        m = re.fullmatch(r"/v1/artists/([^/]+)/top-tracks", path)
+        if m:
+            return 200, self._top_tracks(m.group(1))
+        m = re.fullmatch(r"/v1/artists/([^/]+)", path)
+        if m:
+            return 200, self._artist(m.group(1))
+        return 404, {"error": {"status": 404, "message": "Service not found"}}
+
+    def _handler(server):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def setup(self):
+                super().setup()
+                # Headers and body go out as separate writes; don't let Nagle delay the body
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body, headers=()):
+                data = (body if isinstance(body, str) else json.dumps(body)).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in headers:
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                server._count("token")
+                self._reply(*server.route("POST", self.path, {}))
+
+            def do_GET(self):
+                server._count("requests")
+                delay, roll_429, roll_err = server._roll()
+                if delay:
+                    time.sleep(delay)
+                if roll_429 < server.rate_429:
+                    server._count("429")
+                    return self._reply(429, {"error": {"status": 429, "message": "API rate limit exceeded"}},
+                                       [("Retry-After", str(server.retry_after))])
+                if roll_err < server.error_rate:
+                    server._count("503")
+                    return self._reply(503, {"error": {"status": 503, "message": "Service unavailable"}})
+                url = urlparse(self.path)
+                self._reply(*server.route("GET", url.path, parse_qs(url.query)))
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", default=FIXTURES)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = MockSpotifyServer(port=args.port, fixtures=args.fixtures, latency_ms=args.latency_ms,
+                               jitter_ms=args.jitter_ms, rate_429=args.rate_429,
+                               retry_after=args.retry_after, error_rate=args.error_rate)
+    print(f"Mock Spotify API on {server.api_base} (token: {server.token_url})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
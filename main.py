@@ -1,28 +1,25 @@
 import os
 from dotenv import load_dotenv
 
-from spotify_tool import SpotifyAPI
+from spotify_tool import SpotifyAPI, ResponseCache
 from spotify_tool import services
+from spotify_tool.artist_store import ArtistStore
 
 # Load secrets
 load_dotenv()
 
-api = SpotifyAPI(os.environ["SPOTIFY_CLIENT_ID"], os.environ["SPOTIFY_CLIENT_SECRET"])
 
-artists = api.search_artists("four tet", limit=5)
+def make_api():
+    # Cache responses on disk so repeat reports reuse earlier fetches
+    cache = ResponseCache(".spotify_cache.sqlite")
+    return SpotifyAPI(os.environ["SPOTIFY_CLIENT_ID"], os.environ["SPOTIFY_CLIENT_SECRET"], cache=cache)
 
-if artists:
-    artist_id = artists[0]["id"]  # take the first result’s ID
-    df = services.build_top_tracks_df(api, artist_id)  # build top tracks DataFrame
-    df = services.sort_top_tracks_df(df, sort_col="Popularity", ascending=False)
-
-query = "four tet"  # test query
-url = "https://api.spotify.com/v1/search"
-params = {"q": query, "type": "artist", "limit": 5}  # parsed list of dicts
 
 # MAIN LOOP
 def main():
-    searched_artists = []
+    api = make_api()
+    # Saved searches persist between runs
+    store = ArtistStore("saved_artists.sqlite")
 
     while True:
         print("")
@@ -53,8 +50,7 @@ def main():
                 # Add to saved searches
                 choice1 = input("Add this artist to your saved searches? (y/n): ").lower()
                 if choice1 == "y":
-                    if not any(a["id"] == artist["id"] for a in searched_artists):
-                        searched_artists.append(artist)
+                    if store.add(artist):
                         print(f"{artist['name']} added to saved searches.\n")
                     else:
                         print(f"{artist['name']} is already in your saved searches.\n")
@@ -66,21 +62,19 @@ def main():
 
             # Individual artist report
             if report_choice == "1":
-                if not searched_artists:
+                if not len(store):
                     print("No artists saved yet.")
                 else:
-                    for item in searched_artists:
+                    for item in store.iter_artists():
                         print(item["name"])
 
                     name = input("Enter the artist name: ").strip().lower()
-                    match = next((a for a in searched_artists if a["name"].lower() == name), None)
+                    match = store.find(name)
 
                     if not match:
                         print("Artist not in saved searches.")
                     else:
                         # 3. Build + sort
-                        services.build_top_tracks_df(api, match["id"])
-
                         # Build raw DF
                         df_raw = services.build_top_tracks_df(api, match["id"])
 
@@ -100,7 +94,7 @@ def main():
 
             # Comparison artist report
             elif report_choice == "2":
-                if len(searched_artists) >= 2:
+                if len(store) >= 2:
 
                     # 1. Ask how to sort; default if blank or invalid
                     print("")
@@ -118,7 +112,7 @@ def main():
                     ascending = (order == "asc")
 
                     # 3. Build + sort
-                    df = services.build_comparison_df(api, searched_artists)  # Followers/Popularity must be ints
+                    df = services.build_comparison_df(api, store.iter_artists())  # Followers/Popularity must be ints
                     df = services.sort_comparison_df(df, sort_col=sort_col, ascending=ascending)
 
                     # 4. Write Excel
@@ -131,34 +125,33 @@ def main():
 
         # 3. Print saved searches
         elif user_prompt == "saved":
-            if not searched_artists:
+            if not len(store):
                 print("")
                 print("No artists saved yet.")
             else:
                 print("")
                 print("Saved artists:")
-                for item in searched_artists:
+                for item in store.iter_artists():
                     print(item["name"])
 
         # 4. Delete artist
         elif user_prompt == "delete":
             print("Saved artists:")
-            for item in searched_artists:
+            for item in store.iter_artists():
                 print(item["name"])
 
             print("")
             delete_choice = input("Enter the artist to delete: ").lower()
 
-            for item in searched_artists:
-                if item["name"].lower() == delete_choice:
-                    searched_artists.remove(item)
-                    print(f"{item['name']} has been deleted from your saved searches.")
-                    break
+            item = store.find(delete_choice)
+            if item and store.remove(item["id"]):
+                print(f"{item['name']} has been deleted from your saved searches.")
 
         # 4. Quit
         elif user_prompt == "quit":
             print("")
             print("Goodbye!")
+            store.close()
             break
 
         else:
@@ -1,4 +1,7 @@
 from .spotify_api import SpotifyAPI
+from .async_api import AsyncSpotifyAPI
+from .cache import ResponseCache
+from .token_cache import FileTokenCache
 from . import services
 
-__all__ = ["SpotifyAPI", "services"]
\ No newline at end of file
+__all__ = ["SpotifyAPI", "AsyncSpotifyAPI", "ResponseCache", "FileTokenCache", "services"]
\ No newline at end of file
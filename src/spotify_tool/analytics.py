@@ -0,0 +1,116 @@
+from typing import Iterable, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+PERCENTILES = (0.25, 0.5, 0.75, 0.9)
+
+
+# Frames (built column-wise straight from JSON)
+def tracks_frame(payloads) -> pd.DataFrame:
+    """
+    Top-tracks JSON for many artists -> one long DataFrame.
+
+    payloads: {artist_id: top_tracks_json} or iterable of (artist_id, json).
+    Columns: artist_id, rank, track_id, track, album_id, album, popularity,
+    duration_ms, duration_min (float minutes).
+    """
+    items = payloads.items() if isinstance(payloads, Mapping) else payloads
+    owners, ranks, tracks = [], [], []
+    for artist_id, data in items:
+        batch = (data or {}).get("tracks", []) or []
+        owners.extend([artist_id] * len(batch))
+        ranks.extend(range(1, len(batch) + 1))
+        tracks.extend(batch)
+
+    albums = [t.get("album") or {} for t in tracks]
+    duration_ms = np.fromiter((t.get("duration_ms") or 0 for t in tracks), dtype=np.int32, count=len(tracks))
+    return pd.DataFrame({
+        "artist_id": pd.Categorical(owners),
+        "rank": np.asarray(ranks, dtype=np.int16),
+        "track_id": [t.get("id", "") for t in tracks],
+        "track": [t.get("name", "") for t in tracks],
+        "album_id": pd.Categorical([a.get("id", "") for a in albums]),
+        "album": pd.Categorical([a.get("name", "") for a in albums]),
+        "popularity": np.fromiter((t.get("popularity") or 0 for t in tracks), dtype=np.int32, count=len(tracks)),
+        "duration_ms": duration_ms,
+        "duration_min": (duration_ms / 60000).astype(np.float32),
+    })
+
+
+def artists_frame(profiles: Iterable) -> pd.DataFrame:
+    """Raw artist profiles (None skipped) -> artist_id, name, followers, popularity, genres."""
+    profiles = [p for p in profiles if p]
+    return pd.DataFrame({
+        "artist_id": pd.Categorical([p.get("id", "") for p in profiles]),
+        "name": [p.get("name", "") for p in profiles],
+        "followers": np.fromiter(((p.get("followers") or {}).get("total", 0) for p in profiles),
+                                 dtype=np.int64, count=len(profiles)),
+        "popularity": np.fromiter((p.get("popularity") or 0 for p in profiles),
+                                  dtype=np.int32, count=len(profiles)),
+        "genres": [", ".join(p.get("genres") or []) for p in profiles],
+    })
+
+
+# Aggregates (one groupby pass per metric family, all artists at once)
+def artist_aggregates(tracks: pd.DataFrame, artists: pd.DataFrame = None,
+                      percentiles: Sequence[float] = PERCENTILES) -> pd.DataFrame:
+    """
+    Per-artist metrics from tracks_frame (and optionally artists_frame):
+      tracks, popularity_mean, popularity_p25/p50/...,
+      duration_mean/median/std/min/max (minutes),
+      albums, top_album_share, album_hhi (sum of squared album shares; 1 = one album),
+      followers, followers_per_popularity (when `artists` is given).
+    """
+    g = tracks.groupby("artist_id", observed=True, sort=False)
+
+    out = pd.DataFrame({"tracks": g.size(), "popularity_mean": g["popularity"].mean()})
+
+    pct = g["popularity"].quantile(list(percentiles)).unstack()
+    pct.columns = [f"popularity_p{int(round(q * 100))}" for q in pct.columns]
+    out = out.join(pct)
+
+    dur = g["duration_min"].agg(["mean", "median", "std", "min", "max"])
+    dur.columns = [f"duration_{c}" for c in dur.columns]
+    out = out.join(dur)
+
+    counts = tracks.groupby(["artist_id", "album_id"], observed=True, sort=False).size()
+    shares = counts / counts.groupby(level=0, observed=True).transform("sum")
+    by_artist = shares.groupby(level=0, observed=True)
+    out = out.join(pd.DataFrame({
+        "albums": by_artist.size(),
+        "top_album_share": by_artist.max(),
+        "album_hhi": (shares ** 2).groupby(level=0, observed=True).sum(),
+    }))
+
+    if artists is not None and not artists.empty:
+        a = artists.drop_duplicates("artist_id", keep="last").set_index("artist_id")
+        out = out.join(a[["name", "followers", "popularity"]].rename(columns={"popularity": "artist_popularity"}))
+        out["followers_per_popularity"] = out["followers"] / out["artist_popularity"].replace(0, np.nan)
+
+    out.index = out.index.astype(str)
+    out.index.name = "artist_id"
+    return out.reset_index()
+
+
+def rank_changes(previous: pd.DataFrame, current: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compare two tracks_frame snapshots per (artist_id, track_id).
+    rank_change > 0 means the track moved up; status is new / dropped / moved / same.
+    """
+    cols = ["artist_id", "track_id", "track", "rank"]
+    prev = previous[cols].astype({"artist_id": str})
+    curr = current[cols].astype({"artist_id": str})
+    merged = prev.merge(curr, on=["artist_id", "track_id"], how="outer", suffixes=("_prev", "_curr"))
+    merged["track"] = merged["track_curr"].fillna(merged["track_prev"])
+
+    rank_prev = merged["rank_prev"].astype("Int16")
+    rank_curr = merged["rank_curr"].astype("Int16")
+    merged["rank_prev"], merged["rank_curr"] = rank_prev, rank_curr
+    merged["rank_change"] = rank_prev - rank_curr
+
+    status = np.where(rank_prev.isna(), "new",
+                      np.where(rank_curr.isna(), "dropped",
+                               np.where(merged["rank_change"].fillna(0) == 0, "same", "moved")))
+    merged["status"] = pd.Categorical(status, categories=["new", "dropped", "moved", "same"])
+    return merged[["artist_id", "track_id", "track", "rank_prev", "rank_curr", "rank_change", "status"]]
@@ -0,0 +1,172 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Iterable, Iterator, List, Optional
+
+from .resolver import normalize_name
+
+_COLUMNS = "id, name, url, genres, followers, popularity"
+
+
+def _row_to_artist(row) -> dict:
+    artist_id, name, url, genres, followers, popularity = row
+    return {
+        "id": artist_id,
+        "name": name,
+        "url": url or "",
+        "genres": json.loads(genres) if genres else [],
+        "followers": followers or 0,
+        "popularity": popularity or 0,
+    }
+
+
+class ArtistStore:
+    """
+    Saved artists, persisted in SQLite at `path` (":memory:" for a throwaway store).
+
+    Artists are the parse_artist() dicts that SpotifyAPI.search_artists
+    returns. Rows are keyed by Spotify ID with a second index on the
+    normalized name (resolver.normalize_name), so duplicate checks, name
+    and prefix lookups are index seeks instead of list scans. Tags group
+    artists into rosters. iter_artists()/iter_ids() page with a keyset
+    (WHERE id > last) so tens of thousands of rows are never loaded at once.
+    """
+
+    def __init__(self, path: str = "saved_artists.sqlite"):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS artists ("
+            " id TEXT PRIMARY KEY, name TEXT NOT NULL, norm TEXT NOT NULL, url TEXT,"
+            " genres TEXT, followers INTEGER, popularity INTEGER, saved_at REAL NOT NULL"
+            ") WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS artists_norm ON artists (norm, id);"
+            "CREATE TABLE IF NOT EXISTS artist_tags (tag TEXT NOT NULL, artist_id TEXT NOT NULL,"
+            " PRIMARY KEY (tag, artist_id)) WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS artist_tags_artist ON artist_tags (artist_id);"
+        )
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM artists").fetchone()[0]
+
+    def __contains__(self, artist_id):
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM artists WHERE id = ?", (artist_id,)).fetchone() is not None
+
+    # Writes
+    def add(self, artist: dict) -> bool:
+        """Save one artist. Returns False if that ID was already saved (its fields are refreshed)."""
+        new = artist.get("id") not in self
+        self.add_many([artist])
+        return new
+
+    def add_many(self, artists: Iterable[dict], tag: Optional[str] = None) -> int:
+        """Bulk upsert (one transaction); optionally tag them all. Returns rows written."""
+        now = time.time()
+        rows = [
+            (a["id"], a.get("name") or "", normalize_name(a.get("name") or ""), a.get("url") or "",
+             json.dumps(a.get("genres") or []), int(a.get("followers") or 0),
+             int(a.get("popularity") or 0), now)
+            for a in artists if a and a.get("id")
+        ]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO artists VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (id) DO UPDATE SET name = excluded.name, norm = excluded.norm,"
+                " url = excluded.url, genres = excluded.genres, followers = excluded.followers,"
+                " popularity = excluded.popularity",
+                rows,
+            )
+            if tag:
+                self._db.executemany("INSERT OR IGNORE INTO artist_tags VALUES (?, ?)",
+                                     [(tag, r[0]) for r in rows])
+        return len(rows)
+
+    def remove(self, artist_id: str) -> bool:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM artist_tags WHERE artist_id = ?", (artist_id,))
+            return self._db.execute("DELETE FROM artists WHERE id = ?", (artist_id,)).rowcount > 0
+
+    # Tags
+    def tag(self, tag: str, artist_ids: Iterable[str]):
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR IGNORE INTO artist_tags VALUES (?, ?)",
+                                 [(tag, a) for a in artist_ids])
+
+    def untag(self, tag: str, artist_ids: Iterable[str]):
+        with self._lock, self._db:
+            self._db.executemany("DELETE FROM artist_tags WHERE tag = ? AND artist_id = ?",
+                                 [(tag, a) for a in artist_ids])
+
+    def tags(self) -> dict:
+        """{tag: artist count}"""
+        with self._lock:
+            return dict(self._db.execute(
+                "SELECT tag, COUNT(*) FROM artist_tags GROUP BY tag ORDER BY tag").fetchall())
+
+    # Lookups
+    def get(self, artist_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute(f"SELECT {_COLUMNS} FROM artists WHERE id = ?", (artist_id,)).fetchone()
+        return _row_to_artist(row) if row else None
+
+    def find(self, name: str) -> Optional[dict]:
+        """Saved artist whose normalized name matches (most followers wins)."""
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {_COLUMNS} FROM artists WHERE norm = ? ORDER BY followers DESC LIMIT 1",
+                (normalize_name(name),),
+            ).fetchone()
+        return _row_to_artist(row) if row else None
+
+    def prefix(self, text: str, limit: int = 20) -> List[dict]:
+        """Saved artists whose normalized name starts with `text` (an index range scan)."""
+        norm = normalize_name(text)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {_COLUMNS} FROM artists WHERE norm >= ? AND norm < ? ORDER BY norm, id LIMIT ?",
+                (norm, norm + "\U0010ffff", limit),
+            ).fetchall()
+        return [_row_to_artist(r) for r in rows]
+
+    # Paging
+    def page(self, after: Optional[str] = None, limit: int = 1000, tag: Optional[str] = None) -> List[dict]:
+        """Up to `limit` artists with id > `after`, in ID order; pass the last ID back for the next page."""
+        with self._lock:
+            if tag is None:
+                rows = self._db.execute(
+                    f"SELECT {_COLUMNS} FROM artists WHERE id > ? ORDER BY id LIMIT ?",
+                    (after or "", limit),
+                ).fetchall()
+            else:
+                rows = self._db.execute(
+                    f"SELECT {_COLUMNS} FROM artist_tags t JOIN artists ON id = t.artist_id"
+                    " WHERE t.tag = ? AND t.artist_id > ? ORDER BY t.artist_id LIMIT ?",
+                    (tag, after or "", limit),
+                ).fetchall()
+        return [_row_to_artist(r) for r in rows]
+
+    def iter_artists(self, tag: Optional[str] = None, batch: int = 1000) -> Iterator[dict]:
+        """Every saved artist (optionally one tag), fetched `batch` rows at a time."""
+        after = None
+        while True:
+            rows = self.page(after, limit=batch, tag=tag)
+            yield from rows
+            if len(rows) < batch:
+                return
+            after = rows[-1]["id"]
+
+    def iter_ids(self, tag: Optional[str] = None, batch: int = 1000) -> Iterator[str]:
+        return (a["id"] for a in self.iter_artists(tag=tag, batch=batch))
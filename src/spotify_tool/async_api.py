@@ -0,0 +1,85 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from .spotify_api import SpotifyAPI
+
+
+class AsyncSpotifyAPI:
+    """
+    asyncio counterpart of SpotifyAPI with a bounded number of requests in flight.
+
+    Each call runs the blocking SpotifyAPI method on a dedicated thread pool sized
+    to `concurrency`, so up to `concurrency` requests share the pooled keep-alive
+    session at once. Extra awaiters queue on a semaphore.
+    """
+
+    def __init__(self, client_id, client_secret, concurrency: int = 8, **client_kwargs):
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        self.concurrency = concurrency
+
+        # Keep one socket per in-flight request
+        client_kwargs.setdefault("pool_maxsize", concurrency)
+        self.sync = SpotifyAPI(client_id, client_secret, **client_kwargs)
+
+        self._executor = ThreadPoolExecutor(max_workers=concurrency,
+                                            thread_name_prefix="spotify-async")
+        self._semaphore = None
+        self._token_lock = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        self._executor.shutdown(wait=False)
+        self.sync.close()
+
+    def _primitives(self):
+        # Created lazily so they bind to the running loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._token_lock = asyncio.Lock()
+        return self._semaphore, self._token_lock
+
+    async def _run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: fn(*args, **kwargs))
+
+    async def _get_spotify_token(self):
+        """Fetch or reuse the access token; concurrent callers share one refresh."""
+        _, token_lock = self._primitives()
+        async with token_lock:
+            return await self._run(self.sync._get_spotify_token)
+
+    async def _call(self, fn, *args, **kwargs):
+        semaphore, _ = self._primitives()
+        # Valid token: no lock or executor hop (the sync refresh is single-flight anyway)
+        if not self.sync._token_valid(self.sync.access_token, self.sync.expires_at):
+            await self._get_spotify_token()
+        async with semaphore:
+            return await self._run(fn, *args, **kwargs)
+
+    async def get(self, url, params=None):
+        return await self._call(self.sync.get, url, params=params)
+
+    async def search_artists(self, query: str, limit: int = 5):
+        """Async SpotifyAPI.search_artists: parsed list of artist dicts."""
+        return await self._call(self.sync.search_artists, query, limit=limit)
+
+    async def get_artist_top_tracks(self, artist_id: str, market: str = "US") -> dict:
+        """Async SpotifyAPI.get_artist_top_tracks: raw top-tracks JSON."""
+        return await self._call(self.sync.get_artist_top_tracks, artist_id, market=market)
+
+    async def get_artists(self, ids) -> list:
+        """Async SpotifyAPI.get_artists, with the 50-ID chunks fetched concurrently."""
+        ids = list(ids)
+        size = self.sync.MAX_IDS_PER_REQUEST
+        chunks = [ids[i:i + size] for i in range(0, len(ids), size)]
+        parts = await asyncio.gather(*(self._call(self.sync.get_artists, c) for c in chunks))
+        return [artist for part in parts for artist in part]
+
+    def connection_stats(self):
+        return self.sync.connection_stats()
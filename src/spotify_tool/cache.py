@@ -0,0 +1,222 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from .spotify_api import endpoint_template
+
+# Seconds a cached response stays fresh, per endpoint template
+DEFAULT_TTLS = {
+    "/search": 6 * 3600,
+    "/artists": 24 * 3600,
+    "/artists/{id}": 24 * 3600,
+    "/artists/{id}/top-tracks": 12 * 3600,
+}
+
+
+class _Entry:
+    __slots__ = ("value", "text", "expires_at", "etag", "last_modified")
+
+    def __init__(self, value, text, expires_at, etag=None, last_modified=None):
+        self.value = value
+        self.text = text
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def fresh(self):
+        return time.time() < self.expires_at
+
+
+class ResponseCache:
+    """
+    Two-level response cache for SpotifyAPI.get.
+
+    Front: in-memory LRU of parsed JSON (max_entries).
+    Back:  optional SQLite file (path) holding JSON text, trimmed to
+           max_disk_entries by least-recent access.
+
+    Keys are the URL plus normalized params. Freshness comes from `ttls`
+    (endpoint template -> seconds, see DEFAULT_TTLS) or `default_ttl`.
+    Stale entries are kept with their ETag/Last-Modified validators so a
+    refresh can be a cheap conditional request (304 -> revalidated).
+    Cached values are shared objects: treat them as read-only.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 2048,
+                 max_disk_entries: int = 200_000, ttls: Optional[dict] = None,
+                 default_ttl: float = 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._writes = 0
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0,
+                       "revalidated": 0, "refetched": 0}
+
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, body TEXT NOT NULL, expires_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL, etag TEXT, last_modified TEXT)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+            self._db.commit()
+
+    # Keys
+    @staticmethod
+    def key(url: str, params=None) -> str:
+        """URL + params sorted by name; the search query is case/space-folded."""
+        if not params:
+            return url
+        items = []
+        for k, v in sorted(params.items()):
+            if v is None:
+                continue
+            v = str(v)
+            if k == "q":
+                v = " ".join(v.lower().split())
+            items.append(f"{k}={v}")
+        return url + "?" + "&".join(items)
+
+    def ttl_for(self, url: str) -> float:
+        return self.ttls.get(endpoint_template(url), self.default_ttl)
+
+    # Lookup
+    def _lookup(self, key: str):
+        """Find an entry (fresh or stale) in memory, then on disk -> (entry, source)."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry, "memory"
+            if self._db is None:
+                return None, None
+            row = self._db.execute(
+                "SELECT body, expires_at, etag, last_modified FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None, None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+
+        body, expires_at, etag, last_modified = row
+        entry = _Entry(json.loads(body), body, expires_at, etag, last_modified)
+        with self._lock:
+            self._remember(key, entry)
+        return entry, "disk"
+
+    def lookup(self, url: str, params=None) -> Optional[_Entry]:
+        """
+        Return the cache entry for a request, fresh or stale, or None.
+        Stale entries keep their ETag/Last-Modified validators so the caller
+        can revalidate them with a conditional request.
+        """
+        entry, source = self._lookup(self.key(url, params))
+        with self._lock:
+            if entry is None or not entry.fresh:
+                self._stats["misses"] += 1
+            else:
+                self._stats[f"{source}_hits"] += 1
+        return entry
+
+    def get(self, url: str, params=None):
+        """Return the cached JSON if present and fresh, else None."""
+        entry = self.lookup(url, params)
+        return entry.value if entry is not None and entry.fresh else None
+
+    # Store
+    def set(self, url: str, params, value, text: Optional[str] = None,
+            etag: Optional[str] = None, last_modified: Optional[str] = None,
+            refetched: bool = False):
+        """
+        Cache a parsed JSON response (`text` is its raw body, if at hand).
+        `refetched` marks a full download that replaced a stale entry.
+        """
+        key = self.key(url, params)
+        entry = _Entry(value, text, time.time() + self.ttl_for(url), etag, last_modified)
+        with self._lock:
+            self._remember(key, entry)
+            self._stats["stores"] += 1
+            if refetched:
+                self._stats["refetched"] += 1
+            if self._db is not None:
+                self._persist(key, entry)
+
+    def revalidated(self, url: str, params, entry: _Entry):
+        """A 304 confirmed `entry`: extend its lifetime, keep the parsed body."""
+        key = self.key(url, params)
+        entry.expires_at = time.time() + self.ttl_for(url)
+        with self._lock:
+            self._remember(key, entry)
+            self._stats["revalidated"] += 1
+            if self._db is not None:
+                self._db.execute(
+                    "UPDATE responses SET expires_at = ?, accessed_at = ? WHERE key = ?",
+                    (entry.expires_at, time.time(), key),
+                )
+                self._db.commit()
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _persist(self, key, entry):
+        body = entry.text if entry.text is not None else json.dumps(entry.value)
+        self._db.execute(
+            "INSERT OR REPLACE INTO responses (key, body, expires_at, accessed_at, etag, last_modified)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (key, body, entry.expires_at, time.time(), entry.etag, entry.last_modified),
+        )
+        self._writes += 1
+        # Trim the file every so often rather than on every write
+        if self._writes % 256 == 0:
+            self._trim_disk()
+        self._db.commit()
+
+    def _trim_disk(self):
+        (count,) = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()
+        extra = count - self.max_disk_entries
+        if extra > 0:
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN"
+                " (SELECT key FROM responses ORDER BY accessed_at LIMIT ?)", (extra,)
+            )
+            self._stats["evictions"] += extra
+
+    # Housekeeping
+    def stats(self) -> dict:
+        """Hit/miss counters plus hit_rate and current memory size."""
+        with self._lock:
+            out = dict(self._stats)
+            out["entries"] = len(self._memory)
+        lookups = out["memory_hits"] + out["disk_hits"] + out["misses"]
+        out["hit_rate"] = round((out["memory_hits"] + out["disk_hits"]) / lookups, 3) if lookups else 0.0
+        return out
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.commit()
+                self._db.close()
+                self._db = None
@@ -0,0 +1,292 @@
+"""
+Non-interactive batch CLI.
+
+    spotify-tool search  artists.txt            # name -> best match (JSON Lines)
+    spotify-tool report  artists.txt -f excel   # top tracks, one workbook
+    spotify-tool report  artists.txt -f pdf -o pack/   # one PDF per artist
+    spotify-tool report  artists.txt --market US --market GB   # several markets
+    spotify-tool compare - --sort popularity    # manifest from stdin
+    spotify-tool compare --saved --tag roster   # saved artists (see main.py)
+    spotify-tool refresh artists.txt --max-age 3600
+
+Manifests hold one artist per line: a Spotify ID, spotify:artist:<id>, an
+open.spotify.com/artist/<id> link, or a name to search for. Blank lines and
+lines starting with # are skipped. Credentials come from SPOTIFY_CLIENT_ID /
+SPOTIFY_CLIENT_SECRET (environment or .env). Nothing touches the network
+until a command runs.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from . import instrumentation, services
+from .artist_store import ArtistStore
+from .cache import ResponseCache
+from .markets import MarketTopTracks
+from .resolver import AliasIndex, resolve_names
+from .spotify_api import SpotifyAPI, parse_artist
+from .token_cache import FileTokenCache
+
+ID_RE = re.compile(r"^(?:spotify:artist:|https?://open\.spotify\.com/artist/)?([0-9A-Za-z]{22})(?:\?.*)?$")
+
+# One client per worker process (or shared by every thread)
+_API = None
+
+
+def _init_worker(client_kwargs):
+    global _API
+    _API = _make_api(**client_kwargs)
+
+
+def _make_api(cache_path=None, token_cache_path=None, pool_maxsize=10):
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+    client_id = os.environ.get("SPOTIFY_CLIENT_ID")
+    client_secret = os.environ.get("SPOTIFY_CLIENT_SECRET")
+    if not client_id or not client_secret:
+        raise SystemExit("SPOTIFY_CLIENT_ID and SPOTIFY_CLIENT_SECRET must be set")
+    return SpotifyAPI(
+        client_id, client_secret, pool_maxsize=pool_maxsize,
+        cache=ResponseCache(cache_path) if cache_path else None,
+        token_cache=FileTokenCache(token_cache_path) if token_cache_path else None,
+    )
+
+
+# Manifest
+def read_manifest(path: str):
+    """Yield stripped, non-comment lines from a file or '-' (stdin)."""
+    fh = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in fh:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+
+
+def parse_artist_ref(entry: str):
+    """Return the artist ID if the entry is an ID/URI/link, else None (a name)."""
+    m = ID_RE.match(entry)
+    return m.group(1) if m else None
+
+
+# Worker tasks (module-level so process pools can pickle them)
+def _search_task(query, limit):
+    results = _API.search_artists(query, limit=limit)
+    if not results:
+        return {"query": query, "id": None}
+    exact = next((a for a in results if a["name"].lower() == query.lower()), None)
+    return {"query": query, **(exact or results[0])}
+
+
+def _top_tracks_task(artist_id, market):
+    df = services.build_top_tracks_df(_API, artist_id, market=market)
+    return [{"artist_id": artist_id, "rank": i, **row}
+            for i, row in enumerate(df.to_dict(orient="records"), start=1)]
+
+
+# Helpers
+def _executor(args, client_kwargs):
+    if args.executor == "process":
+        return ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                                   initargs=(client_kwargs,))
+    _init_worker(client_kwargs)
+    return ThreadPoolExecutor(max_workers=args.workers)
+
+
+def _emit(rows, out):
+    for row in rows:
+        out.write(json.dumps(row, default=str, ensure_ascii=False) + "\n")
+        out.flush()
+
+
+def _resolve(args, pool, entries):
+    """Manifest entries -> artist IDs; names go through the local alias index first."""
+    refs = [parse_artist_ref(e) for e in entries]
+    names = [e for e, ref in zip(entries, refs) if ref is None]
+    found = {}
+    if names:
+        index = AliasIndex(args.aliases) if args.aliases else None
+        try:
+            resolved = resolve_names(_API, names, index, max_workers=args.workers)
+        finally:
+            if index is not None:
+                index.close()
+        found = {name: r["id"] for name, r in resolved.items()}
+    ids = []
+    for entry, ref in zip(entries, refs):
+        artist_id = ref or found.get(entry)
+        if artist_id:
+            ids.append(artist_id)
+        else:
+            print(f"No match: {entry}", file=sys.stderr)
+    return list(dict.fromkeys(ids))
+
+
+def _artist_ids(args, pool):
+    """IDs from the manifest, or every saved artist (paged from the store) with --saved."""
+    if args.saved:
+        with ArtistStore(args.store) as store:
+            return list(store.iter_ids(tag=args.tag))
+    if not args.manifest:
+        raise SystemExit("a manifest is required unless --saved is given")
+    return _resolve(args, pool, list(read_manifest(args.manifest)))
+
+
+# Commands
+def cmd_search(args, pool, out):
+    entries = list(read_manifest(args.manifest))
+    refs = [parse_artist_ref(e) for e in entries]
+
+    # IDs/URIs/links need no search: one batched /v1/artists lookup
+    ids = list(dict.fromkeys(r for r in refs if r))
+    profiles = dict(zip(ids, _API.get_artists(ids))) if ids else {}
+    names = [e for e, ref in zip(entries, refs) if ref is None]
+    searched = pool.map(_search_task, names, [args.limit] * len(names))
+
+    def rows():
+        for entry, ref in zip(entries, refs):
+            if ref is None:
+                yield next(searched)
+            elif profiles.get(ref):
+                yield {"query": entry, **parse_artist(profiles[ref])}
+            else:
+                yield {"query": entry, "id": None}
+
+    _emit(rows(), out)
+
+
+def cmd_report(args, pool, out):
+    markets = args.market or ["US"]
+    if args.format != "jsonl" and len(markets) > 1:
+        raise SystemExit(f"--format {args.format} takes a single --market")
+    ids = _artist_ids(args, pool)
+    if args.format == "pdf":
+        from . import pdf_reports
+
+        paths = pdf_reports.render_artist_pdfs(_API, ids, args.output or "reports", market=markets[0],
+                                               fetch_workers=args.workers)
+        print(f"Saved {len(paths)} PDFs to {args.output or 'reports'}", file=sys.stderr)
+        return
+    if args.format == "excel":
+        services.write_roster_workbook(_API, ids, args.output or "roster_top_tracks.xlsx",
+                                       market=markets[0], max_workers=args.workers)
+        return
+    if len(markets) > 1:
+        # Several markets: fetch every pair concurrently, tracks shared across artists/markets
+        tt = MarketTopTracks(_API, max_workers=args.workers)
+        tt.fetch(ids, markets)
+        df = tt.frame(ids, markets).rename(columns={
+            "Artist ID": "artist_id", "Market": "market", "Rank": "rank", "Track ID": "track_id"})
+        _emit(df.to_dict(orient="records"), out)
+        return
+    for rows in pool.map(_top_tracks_task, ids, markets * len(ids)):
+        _emit(rows, out)
+
+
+def cmd_compare(args, pool, out):
+    ids = _artist_ids(args, pool)
+    df = services.build_comparison_df(_API, [{"id": i} for i in ids])
+    sort_col = "Popularity" if args.sort == "popularity" else "Followers"
+    df = services.sort_comparison_df(df, sort_col=sort_col, ascending=args.asc)
+    if args.format == "excel":
+        services.write_comparison_excel(df, args.output or "artist_comparison.xlsx")
+        return
+    if args.format == "pdf":
+        from . import pdf_reports
+
+        pdf_reports.write_comparison_pdf(df, args.output or "artist_comparison_report.pdf", sort_col=sort_col)
+        return
+    _emit(df.to_dict(orient="records"), out)
+
+
+def cmd_refresh(args, pool, out):
+    from .refresh import RefreshEngine
+
+    engine = RefreshEngine(_API, args.state, market=args.market, max_workers=args.workers)
+    try:
+        if args.manifest:
+            engine.track(_resolve(args, pool, list(read_manifest(args.manifest))))
+        _emit(engine.refresh(max_age=args.max_age, budget=args.budget), out)
+    finally:
+        engine.close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="spotify-tool", description="Batch Spotify artist reports.")
+    parser.add_argument("--workers", type=int, default=8, help="parallel workers (default 8)")
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    parser.add_argument("--cache", default=".spotify_cache.sqlite",
+                        help="response cache file ('' to disable; refresh never uses it)")
+    parser.add_argument("--token-cache", default=".spotify_token.json",
+                        help="shared token file ('' to disable)")
+    parser.add_argument("--aliases", default="artist_aliases.sqlite",
+                        help="local name -> ID index ('' to disable)")
+    parser.add_argument("--store", default="saved_artists.sqlite", help="saved-artist store (--saved)")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="write request/stage metrics here on exit ('-' for stderr)")
+    parser.add_argument("--metrics-format", choices=["json", "prometheus"], default="json")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("search", help="best matching artist per name (IDs/links are looked up directly)")
+    p.add_argument("manifest", help="file of names or IDs, or - for stdin")
+    p.add_argument("--limit", type=int, default=5)
+    p.set_defaults(func=cmd_search)
+
+    for name, func, fmt_help in (("report", cmd_report, "top tracks per artist"),
+                                 ("compare", cmd_compare, "followers/popularity comparison")):
+        p = sub.add_parser(name, help=fmt_help)
+        p.add_argument("manifest", nargs="?", help="file of IDs or names, or - for stdin")
+        p.add_argument("--saved", action="store_true", help="use the saved-artist store instead")
+        p.add_argument("--tag", help="with --saved: only artists with this tag")
+        p.add_argument("-f", "--format", choices=["jsonl", "excel", "pdf"], default="jsonl")
+        p.add_argument("-o", "--output",
+                       help="Excel/PDF path (report --format pdf: output directory)")
+        p.set_defaults(func=func)
+        if name == "report":
+            p.add_argument("--market", action="append",
+                           help="market code (repeatable; default US)")
+        else:
+            p.add_argument("--sort", choices=["followers", "popularity"], default="followers")
+            p.add_argument("--asc", action="store_true", help="ascending order")
+
+    p = sub.add_parser("refresh", help="incremental refresh; prints only changes")
+    p.add_argument("manifest", nargs="?", help="artists to add to the refresh set first")
+    p.add_argument("--state", default="refresh_state.sqlite")
+    p.add_argument("--max-age", type=float, default=3600, help="seconds before an artist is due")
+    p.add_argument("--budget", type=int, help="max artists to refresh this run")
+    p.add_argument("--market", default="US")
+    p.set_defaults(func=cmd_refresh)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.metrics:
+        # Covers this process; process-pool workers keep their own counters
+        instrumentation.install().export_at_exit(
+            None if args.metrics == "-" else args.metrics, fmt=args.metrics_format)
+    client_kwargs = {
+        # refresh exists to notice changes; cached answers (hours of TTL) would hide them
+        "cache_path": None if args.command == "refresh" else (args.cache or None),
+        "token_cache_path": args.token_cache or None,
+        "pool_maxsize": max(args.workers, 1),
+    }
+    with _executor(args, client_kwargs) as pool:
+        if _API is None:
+            # Process pool: the parent still needs a client for batched calls
+            _init_worker(client_kwargs)
+        args.func(args, pool, sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
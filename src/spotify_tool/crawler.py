@@ -0,0 +1,294 @@
+import heapq
+import sqlite3
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import requests
+
+from . import services
+from .pagination import iter_artist_albums
+
+# Endpoints that may be switched off for an app; treated as "no neighbours"
+_UNAVAILABLE = {403, 404}
+
+# Node states
+UNEXPANDED, EXPANDED, PARTIAL = 0, 1, 2
+
+
+class ArtistGraphCrawler:
+    """
+    Breadth-first crawl of the artist graph from seed IDs.
+
+    Neighbours of an artist are its related artists (/artists/{id}/related-artists)
+    and the other artists credited on its albums, singles and appearances
+    (first `max_albums` of them). Each artist gets an integer index in
+    discovery order (the ID -> index map is the visited set) and a state:
+    unexpanded, expanded, or partial (expanded after the node budget ran
+    out, so some neighbours could not be added). The frontier is a
+    (depth, index) heap, so seeds added later are still expanded first.
+
+    Budgets: nodes deeper than `max_depth` are not expanded and no nodes are
+    added past `max_nodes`. Once the budget is spent the remaining frontier
+    is still expanded, recording edges between nodes already in the graph.
+    Expansions run on `max_in_flight` threads (one request in flight each),
+    `chunk` nodes at a time.
+
+    With `checkpoint` (SQLite path) new nodes, edges and node states are
+    written after every chunk; building a crawler on an existing checkpoint
+    resumes where it stopped. Partial nodes are expanded again when there
+    is budget left (e.g. resumed with a larger max_nodes).
+
+        crawler = ArtistGraphCrawler(api, max_depth=3, max_nodes=50_000, checkpoint="crawl.sqlite")
+        crawler.crawl(seed_ids)
+        indptr, indices = crawler.adjacency()
+        df = crawler.comparison_df()
+    """
+
+    def __init__(self, api, max_depth: int = 2, max_nodes: int = 50_000, max_in_flight: int = 8,
+                 related: bool = True, collaborators: bool = True,
+                 album_groups: str = "album,single,appears_on", max_albums: int = 50,
+                 chunk: int = 256, checkpoint: Optional[str] = None):
+        self.api = api
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.max_in_flight = max_in_flight
+        self.related = related
+        self.collaborators = collaborators
+        self.album_groups = album_groups
+        self.max_albums = max_albums
+        self.chunk = max(1, int(chunk))
+
+        self.ids: List[str] = []
+        self._index = {}              # artist ID -> node index (the visited set)
+        self.depth = array("B")
+        self.state = array("B")       # UNEXPANDED / EXPANDED / PARTIAL
+        self.edge_src = array("I")    # directed edges: node -> neighbour
+        self.edge_dst = array("I")
+        self.unavailable = 0          # expansions that got 403/404
+
+        self._partial = {}            # PARTIAL node -> neighbour indices it already has
+        self._saved_nodes = 0
+        self._saved_edges = 0
+        self._dirty = set()           # saved nodes whose depth/state changed
+        self._db = None
+        if checkpoint:
+            self._open_checkpoint(checkpoint)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    # Checkpoint
+    def _open_checkpoint(self, path: str):
+        self._db = sqlite3.connect(path)
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS crawl_nodes (idx INTEGER PRIMARY KEY, artist_id TEXT NOT NULL,"
+            " depth INTEGER NOT NULL, state INTEGER NOT NULL DEFAULT 0);"
+            "CREATE TABLE IF NOT EXISTS crawl_edges (src INTEGER NOT NULL, dst INTEGER NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS crawl_meta (key TEXT PRIMARY KEY, value INTEGER);"
+        )
+        meta = dict(self._db.execute("SELECT key, value FROM crawl_meta"))
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(crawl_nodes)")}
+        if "state" not in columns:
+            # Older checkpoints kept a cursor: nodes before it were expanded
+            with self._db:
+                self._db.execute("ALTER TABLE crawl_nodes ADD COLUMN state INTEGER NOT NULL DEFAULT 0")
+                self._db.execute("UPDATE crawl_nodes SET state = ? WHERE idx < ?",
+                                 (EXPANDED, meta.get("cursor", 0)))
+
+        rows = self._db.execute("SELECT artist_id, depth, state FROM crawl_nodes ORDER BY idx")
+        for artist_id, depth, state in rows:
+            self._index[artist_id] = len(self.ids)
+            self.ids.append(artist_id)
+            self.depth.append(depth)
+            self.state.append(state)
+        self._partial = {i: set() for i, state in enumerate(self.state) if state == PARTIAL}
+        for src, dst in self._db.execute("SELECT src, dst FROM crawl_edges"):
+            self.edge_src.append(src)
+            self.edge_dst.append(dst)
+            if src in self._partial:
+                self._partial[src].add(dst)
+        self.unavailable = meta.get("unavailable", 0)
+        self._saved_nodes, self._saved_edges = len(self.ids), len(self.edge_src)
+
+    def _save(self):
+        if self._db is None:
+            return
+        with self._db:
+            self._db.executemany(
+                "UPDATE crawl_nodes SET depth = ?, state = ? WHERE idx = ?",
+                ((self.depth[i], self.state[i], i) for i in sorted(self._dirty)),
+            )
+            self._db.executemany(
+                "INSERT INTO crawl_nodes VALUES (?, ?, ?, ?)",
+                ((i, self.ids[i], self.depth[i], self.state[i])
+                 for i in range(self._saved_nodes, len(self.ids))),
+            )
+            self._db.executemany(
+                "INSERT INTO crawl_edges VALUES (?, ?)",
+                zip(self.edge_src[self._saved_edges:], self.edge_dst[self._saved_edges:]),
+            )
+            self._db.execute("INSERT OR REPLACE INTO crawl_meta VALUES ('unavailable', ?)",
+                             (self.unavailable,))
+        self._dirty.clear()
+        self._saved_nodes, self._saved_edges = len(self.ids), len(self.edge_src)
+
+    def _set(self, idx: int, depth: int = None, state: int = None):
+        if depth is not None:
+            self.depth[idx] = depth
+        if state is not None:
+            self.state[idx] = state
+        if idx < self._saved_nodes:
+            self._dirty.add(idx)
+
+    # Graph building
+    def _add_node(self, artist_id: str, depth: int) -> Optional[int]:
+        idx = self._index.get(artist_id)
+        if idx is None and len(self.ids) < self.max_nodes:
+            idx = self._index[artist_id] = len(self.ids)
+            self.ids.append(artist_id)
+            self.depth.append(min(depth, 255))
+            self.state.append(UNEXPANDED)
+        return idx
+
+    def _neighbours(self, artist_id: str) -> Tuple[List[str], bool]:
+        """-> (neighbour IDs in first-seen order, whether an endpoint was unavailable)."""
+        found, unavailable = {}, False
+        if self.related:
+            try:
+                data = self.api.get(f"{self.api.API_BASE}/artists/{artist_id}/related-artists") or {}
+            except requests.HTTPError as e:
+                if e.response is None or e.response.status_code not in _UNAVAILABLE:
+                    raise
+                data, unavailable = {}, True
+            for artist in data.get("artists") or []:
+                found.setdefault(artist.get("id"), None)
+        if self.collaborators:
+            try:
+                for album in iter_artist_albums(self.api, artist_id, self.album_groups,
+                                                max_items=self.max_albums, prefetch=False):
+                    for other in album["artists"]:
+                        found.setdefault(other, None)
+            except requests.HTTPError as e:
+                if e.response is None or e.response.status_code not in _UNAVAILABLE:
+                    raise
+                unavailable = True
+        for skip in (artist_id, None, ""):
+            found.pop(skip, None)
+        return list(found), unavailable
+
+    def _frontier(self) -> list:
+        """(depth, index) heap of nodes still to expand."""
+        room = len(self.ids) < self.max_nodes
+        heap = [(self.depth[i], i) for i in range(len(self.ids))
+                if self.depth[i] < self.max_depth
+                and (self.state[i] == UNEXPANDED or (room and self.state[i] == PARTIAL))]
+        heapq.heapify(heap)
+        return heap
+
+    def _record(self, i: int, neighbours: List[str]):
+        """Add node i's edges; mark it PARTIAL if the node budget dropped any neighbour."""
+        # Re-expansion of a PARTIAL node: skip the edges recorded last time
+        known = self._partial.pop(i, set())
+        complete = True
+        for artist_id in neighbours:
+            j = self._add_node(artist_id, self.depth[i] + 1)
+            if j is None:
+                complete = False
+            elif j not in known:
+                known.add(j)
+                self.edge_src.append(i)
+                self.edge_dst.append(j)
+        if not complete:
+            self._partial[i] = known
+        self._set(i, state=EXPANDED if complete else PARTIAL)
+
+    def crawl(self, seeds: Iterable[str] = (), progress=None) -> dict:
+        """
+        Add `seeds` at depth 0 and expand breadth-first until the frontier is
+        empty. Seeds may be added on later calls (or after a resume): known
+        unexpanded artists move to depth 0. progress(stats) is called after
+        every chunk. Returns stats().
+        """
+        for seed in seeds:
+            if not seed:
+                continue
+            idx = self._index.get(seed)
+            if idx is None:
+                self._add_node(seed, 0)
+            elif self.state[idx] != EXPANDED and self.depth[idx] > 0:
+                self._set(idx, depth=0)
+
+        heap = self._frontier()
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+            while heap:
+                batch = []
+                while heap and len(batch) < self.chunk:
+                    batch.append(heapq.heappop(heap)[1])
+                results = pool.map(self._neighbours, [self.ids[i] for i in batch])
+                before = len(self.ids)
+                for i, (neighbours, unavailable) in zip(batch, results):
+                    self.unavailable += unavailable
+                    self._record(i, neighbours)
+                for j in range(before, len(self.ids)):
+                    if self.depth[j] < self.max_depth:
+                        heapq.heappush(heap, (self.depth[j], j))
+                self._save()
+                if progress is not None:
+                    progress(self.stats())
+        self._save()
+        return self.stats()
+
+    # Results
+    def adjacency(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        CSR adjacency: neighbours of node i are indices[indptr[i]:indptr[i + 1]].
+        Node i is self.ids[i].
+        """
+        src = np.array(self.edge_src, dtype=np.int64)
+        dst = np.array(self.edge_dst, dtype=np.int32)
+        order = np.argsort(src, kind="stable")
+        indptr = np.zeros(len(self.ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=len(self.ids)), out=indptr[1:])
+        return indptr, dst[order]
+
+    def neighbours(self, artist_id: str) -> List[str]:
+        """One node's neighbours (builds the CSR each call; use adjacency() for bulk work)."""
+        idx = self._index.get(artist_id)
+        if idx is None:
+            return []
+        indptr, indices = self.adjacency()
+        return [self.ids[j] for j in indices[indptr[idx]:indptr[idx + 1]]]
+
+    def degrees(self) -> np.ndarray:
+        """In-degree per node (how many crawled artists point at it)."""
+        return np.bincount(np.array(self.edge_dst, dtype=np.int64), minlength=len(self.ids))
+
+    def comparison_df(self, api=None) -> pd.DataFrame:
+        """
+        services.build_comparison_df over every node (profiles in batches of 50),
+        plus Artist ID, Depth and Links (in-degree) columns, most-linked first.
+        """
+        df = services.build_comparison_df(api or self.api, ({"id": i} for i in self.ids))
+        if df.empty:
+            return df
+        df.insert(0, "Artist ID", self.ids)
+        df["Depth"] = np.array(self.depth, dtype=np.int16)
+        df["Links"] = self.degrees()
+        return df.sort_values(["Links", "Followers"], ascending=False, ignore_index=True)
+
+    def stats(self) -> dict:
+        return {
+            "nodes": len(self.ids),
+            "edges": len(self.edge_src),
+            "expanded": self.state.count(EXPANDED),
+            "partial": self.state.count(PARTIAL),
+            "frontier": sum(1 for i in range(len(self.ids))
+                            if self.state[i] == UNEXPANDED and self.depth[i] < self.max_depth),
+            "max_depth_seen": max(self.depth) if self.depth else 0,
+            "unavailable": self.unavailable,
+        }
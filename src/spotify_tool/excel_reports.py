@@ -0,0 +1,140 @@
+import itertools
+import re
+import sys
+from typing import Iterable, Optional, Sequence
+
+import xlsxwriter
+
+# Column name -> (width, number format); unknown columns get DEFAULT_COLUMN
+COLUMN_FORMATS = {
+    "Track": (30, None),
+    "Album": (30, None),
+    "Popularity": (11, "0"),
+    "Duration (min)": (14, "0"),
+    "Artist": (22, None),
+    "Followers": (14, "#,##0"),  # comma thousands
+    "Genres": (40, None),
+    "Top Tracks": (11, "0"),
+    "Sheet": (32, None),
+}
+DEFAULT_COLUMN = (16, None)
+
+TOP_TRACKS_COLUMNS = ["Track", "Album", "Popularity", "Duration (min)"]
+COMPARISON_COLUMNS = ["Artist", "Followers", "Popularity", "Genres"]
+SUMMARY_COLUMNS = COMPARISON_COLUMNS + ["Top Tracks", "Sheet"]
+
+MAX_SHEET_NAME = 31  # Excel limit
+
+
+def safe_name(name: str) -> str:
+    """File-name-safe version of an artist name (spaces etc. -> underscores)."""
+    return re.sub(r'[^A-Za-z0-9._-]+', "_", name or "").strip("_")
+
+
+def unique_sheet_name(name: str, used: set) -> str:
+    """
+    Excel-safe sheet name built like safe_name, cut to 31 chars.
+    Collisions (case-insensitive) get _2, _3, ... suffixes. Adds the result to `used`.
+    """
+    base = safe_name(name)[:MAX_SHEET_NAME] or "Artist"
+    candidate, n = base, 2
+    while candidate.lower() in used:
+        suffix = f"_{n}"
+        candidate = base[:MAX_SHEET_NAME - len(suffix)] + suffix
+        n += 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def chain_rows(row_groups: Iterable[Iterable]) -> Iterable:
+    """Flatten per-artist row generators into one lazy row stream."""
+    return itertools.chain.from_iterable(row_groups)
+
+
+class SheetFormats:
+    """One xlsxwriter format object per distinct style in a workbook."""
+
+    def __init__(self, book):
+        self.book = book
+        self._cache = {}
+
+    def get(self, **props):
+        key = tuple(sorted(props.items()))
+        if key not in self._cache:
+            self._cache[key] = self.book.add_format(props)
+        return self._cache[key]
+
+
+def add_sheet(book, sheet_name: str, columns: Sequence[str], formats: Optional[SheetFormats] = None):
+    """Create a sheet with bold header, column widths and number formats."""
+    formats = formats or SheetFormats(book)
+    ws = book.add_worksheet(sheet_name)
+
+    # Column widths + formats must be set before rows in constant_memory mode
+    for idx, col in enumerate(columns):
+        width, num_format = COLUMN_FORMATS.get(col, DEFAULT_COLUMN)
+        ws.set_column(idx, idx, width, formats.get(num_format=num_format) if num_format else None)
+
+    # Bold header row
+    ws.write_row(0, 0, list(columns), formats.get(bold=True))
+    return ws
+
+
+def write_rows(ws, columns: Sequence[str], rows: Iterable) -> int:
+    """
+    Stream data rows under the header of a sheet from add_sheet, then freeze
+    the header row and add a filter. Returns the number of rows written.
+
+    rows: dicts keyed by column name, or sequences in column order.
+    """
+    columns = list(columns)
+    count = 0
+    for count, row in enumerate(rows, start=1):
+        if isinstance(row, dict):
+            row = [row.get(col) for col in columns]
+        ws.write_row(count, 0, row)
+
+    # Freeze header row & add filter
+    ws.freeze_panes(1, 0)
+    ws.autofilter(0, 0, max(count, 1), len(columns) - 1)
+    return count
+
+
+def write_rows_sheet(book, sheet_name: str, columns: Sequence[str], rows: Iterable,
+                     formats: Optional[SheetFormats] = None) -> int:
+    """
+    Stream rows into a new formatted sheet (see add_sheet / write_rows).
+    In constant_memory workbooks only the current row is held in memory.
+    """
+    ws = add_sheet(book, sheet_name, columns, formats)
+    return write_rows(ws, columns, rows)
+
+
+def open_workbook(path: str):
+    """xlsxwriter workbook in constant-memory mode (rows flushed as written)."""
+    return xlsxwriter.Workbook(path, {"constant_memory": True, "nan_inf_to_errors": True})
+
+
+def stream_excel(rows: Iterable, path: str, columns: Sequence[str], sheet_name: str) -> int:
+    """Write a single-sheet report from a row iterator. Returns rows written."""
+    book = open_workbook(path)
+    try:
+        return write_rows_sheet(book, sheet_name, columns, rows)
+    finally:
+        book.close()
+
+
+def stream_top_tracks_excel(rows: Iterable, artist_name: str, columns=TOP_TRACKS_COLUMNS) -> str:
+    """Streaming write_top_tracks_excel: rows -> top_tracks_<artist>.xlsx."""
+    path = f"top_tracks_{safe_name(artist_name)}.xlsx"
+    stream_excel(rows, path, columns, "TopTracks")
+    print(f"Saved: {path}", file=sys.stderr)
+    return path
+
+
+def stream_comparison_excel(rows: Iterable, path: str = "artist_comparison.xlsx",
+                            columns=COMPARISON_COLUMNS) -> str:
+    """Streaming write_comparison_excel: rows (e.g. from chain_rows) -> one sheet."""
+    stream_excel(rows, path, columns, "Comparison")
+    print(f"Saved: {path}", file=sys.stderr)
+    return path
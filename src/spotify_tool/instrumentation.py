@@ -0,0 +1,196 @@
+"""
+Opt-in request hooks, stage timings and metrics export.
+
+    inst = instrumentation.install()           # process-wide
+    inst.add_hook(after=lambda e: print(e))    # per-request events
+    inst.export_at_exit("metrics.prom", fmt="prometheus")
+
+SpotifyAPI reports every request (endpoint template, status, bytes,
+latency, retries, cache hits), token fetches and JSON decoding. The
+services build/sort/write stages are timed as spans. Nothing is recorded
+unless an Instrumentation is installed or passed to the client, and then
+the cost is one None check per call.
+"""
+import atexit
+import functools
+import inspect
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current = None
+_NO_SPAN = nullcontext()
+
+
+class Instrumentation:
+    def __init__(self):
+        self.before_request = []
+        self.after_request = []
+        self._lock = threading.Lock()
+        self._requests = {}  # (endpoint, status) -> [count, seconds, bytes, retries, buckets]
+        self._spans = {}     # name -> [count, seconds, max]
+
+    # Hooks
+    def add_hook(self, before=None, after=None):
+        """before(event) runs as a request starts; after(event) once it is done."""
+        if before is not None:
+            self.before_request.append(before)
+        if after is not None:
+            self.after_request.append(after)
+
+    def request_started(self, event: dict):
+        for hook in self.before_request:
+            hook(event)
+
+    def request_finished(self, event: dict):
+        """
+        Record a finished request. event keys: endpoint, method, status,
+        bytes, latency (s), retries, cached (bool).
+        """
+        key = (event.get("endpoint", ""), str(event.get("status", "")))
+        latency = float(event.get("latency") or 0.0)
+        with self._lock:
+            stat = self._requests.get(key)
+            if stat is None:
+                stat = self._requests[key] = [0, 0.0, 0, 0, [0] * len(LATENCY_BUCKETS)]
+            stat[0] += 1
+            stat[1] += latency
+            stat[2] += int(event.get("bytes") or 0)
+            stat[3] += int(event.get("retries") or 0)
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if latency <= bound:
+                    stat[4][i] += 1
+        for hook in self.after_request:
+            hook(event)
+
+    # Spans
+    @contextmanager
+    def span(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_span(name, time.perf_counter() - start)
+
+    def record_span(self, name: str, seconds: float):
+        with self._lock:
+            stat = self._spans.setdefault(name, [0, 0.0, 0.0])
+            stat[0] += 1
+            stat[1] += seconds
+            stat[2] = max(stat[2], seconds)
+
+    # Export
+    def to_json(self) -> dict:
+        with self._lock:
+            requests_ = [
+                {"endpoint": ep, "status": status, "count": c, "seconds_total": round(s, 6),
+                 "seconds_mean": round(s / c, 6) if c else 0.0, "bytes_total": b, "retries_total": r}
+                for (ep, status), (c, s, b, r, _) in sorted(self._requests.items())
+            ]
+            spans = {name: {"count": c, "seconds_total": round(s, 6), "seconds_max": round(m, 6)}
+                     for name, (c, s, m) in sorted(self._spans.items())}
+        return {"requests": requests_, "spans": spans}
+
+    def to_prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            reqs = sorted(self._requests.items())
+            spans = sorted(self._spans.items())
+
+        def labels(ep, status):
+            return f'endpoint="{_escape(ep)}",status="{_escape(status)}"'
+
+        lines += ["# HELP spotify_requests_total Spotify API requests.",
+                  "# TYPE spotify_requests_total counter"]
+        lines += [f"spotify_requests_total{{{labels(ep, st)}}} {v[0]}" for (ep, st), v in reqs]
+        lines += ["# HELP spotify_response_bytes_total Response body bytes.",
+                  "# TYPE spotify_response_bytes_total counter"]
+        lines += [f"spotify_response_bytes_total{{{labels(ep, st)}}} {v[2]}" for (ep, st), v in reqs]
+        lines += ["# HELP spotify_request_retries_total Retries spent on requests.",
+                  "# TYPE spotify_request_retries_total counter"]
+        lines += [f"spotify_request_retries_total{{{labels(ep, st)}}} {v[3]}" for (ep, st), v in reqs]
+
+        lines += ["# HELP spotify_request_seconds Request latency including retries.",
+                  "# TYPE spotify_request_seconds histogram"]
+        for (ep, st), (count, seconds, _, _, buckets) in reqs:
+            lab = labels(ep, st)
+            for bound, n in zip(LATENCY_BUCKETS, buckets):
+                lines.append(f'spotify_request_seconds_bucket{{{lab},le="{bound}"}} {n}')
+            lines.append(f'spotify_request_seconds_bucket{{{lab},le="+Inf"}} {count}')
+            lines.append(f"spotify_request_seconds_sum{{{lab}}} {seconds:.6f}")
+            lines.append(f"spotify_request_seconds_count{{{lab}}} {count}")
+
+        lines += ["# HELP spotify_stage_seconds Time spent in report stages.",
+                  "# TYPE spotify_stage_seconds summary"]
+        for name, (count, seconds, _) in spans:
+            lines.append(f'spotify_stage_seconds_sum{{stage="{_escape(name)}"}} {seconds:.6f}')
+            lines.append(f'spotify_stage_seconds_count{{stage="{_escape(name)}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def export_at_exit(self, path: str = None, fmt: str = "json"):
+        """Write metrics to `path` (or stderr) when the process exits."""
+        if fmt not in {"json", "prometheus"}:
+            raise ValueError("fmt must be 'json' or 'prometheus'")
+
+        def dump():
+            text = self.to_prometheus() if fmt == "prometheus" else json.dumps(self.to_json(), indent=2)
+            if path:
+                with open(path, "w", encoding="utf-8") as fh:
+                    fh.write(text)
+            else:
+                sys.stderr.write(text + "\n")
+
+        atexit.register(dump)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Process-wide instance
+def install(inst: Instrumentation = None) -> Instrumentation:
+    """Make `inst` (or a new Instrumentation) the process-wide default."""
+    global _current
+    _current = inst or Instrumentation()
+    return _current
+
+
+def uninstall():
+    global _current
+    _current = None
+
+
+def current():
+    return _current
+
+
+def span(name: str):
+    """Time a block against the installed Instrumentation (no-op if none)."""
+    inst = _current
+    return inst.span(name) if inst is not None else _NO_SPAN
+
+
+def timed(name: str):
+    """Decorator form of span(); works on plain and async functions."""
+    def decorate(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            inst = _current
+            if inst is None:
+                return fn(*args, **kwargs)
+            with inst.span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
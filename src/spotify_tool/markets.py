@@ -0,0 +1,162 @@
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+MARKET_COLUMNS = ["Artist ID", "Market", "Rank", "Track ID", "Track", "Album",
+                  "Popularity", "Duration (min)"]
+
+
+class MarketTopTracks:
+    """
+    Top tracks for many artists across several markets, deduplicated.
+
+    Every track and album seen is interned once in shared column tables keyed
+    by Spotify ID, so a collaboration that shows up for five artists in three
+    markets is stored once. Each (artist, market) result is just an
+    array('I') of row numbers into the track table, and pairs that were
+    already fetched are never requested again.
+
+        tt = MarketTopTracks(api)
+        tt.fetch(artist_ids, markets=["US", "GB", "DE"])
+        df = tt.frame()
+    """
+
+    def __init__(self, api, max_workers: int = 8):
+        self.api = api
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+
+        # Track table (one row per unique track ID)
+        self._track_rows = {}
+        self.track_ids: List[str] = []
+        self.track_names: List[str] = []
+        self.track_album = array("I")      # row in the album table
+        self.track_popularity = array("B")
+        self.track_duration_ms = array("I")
+
+        # Album table
+        self._album_rows = {}
+        self.album_ids: List[str] = []
+        self.album_names: List[str] = []
+
+        self.results = {}  # (artist_id, market) -> array("I") of track rows
+
+    # Interning
+    def _album_row(self, album: dict) -> int:
+        album_id = album.get("id") or ""
+        row = self._album_rows.get(album_id)
+        if row is None:
+            row = self._album_rows[album_id] = len(self.album_ids)
+            self.album_ids.append(album_id)
+            self.album_names.append(album.get("name", ""))
+        return row
+
+    def _track_row(self, track: dict) -> int:
+        track_id = track.get("id") or ""
+        popularity = min(max(int(track.get("popularity") or 0), 0), 100)
+        row = self._track_rows.get(track_id)
+        if row is None:
+            row = self._track_rows[track_id] = len(self.track_ids)
+            self.track_ids.append(track_id)
+            self.track_names.append(track.get("name", ""))
+            self.track_album.append(self._album_row(track.get("album") or {}))
+            self.track_popularity.append(popularity)
+            self.track_duration_ms.append(int(track.get("duration_ms") or 0))
+        else:
+            # Popularity drifts; keep the latest value
+            self.track_popularity[row] = popularity
+        return row
+
+    def add(self, artist_id: str, market: str, data: dict) -> array:
+        """Intern one top-tracks JSON response and store its row references."""
+        tracks = (data or {}).get("tracks", []) or []
+        with self._lock:
+            rows = array("I", (self._track_row(t) for t in tracks))
+            self.results[(artist_id, market)] = rows
+        return rows
+
+    # Fetching
+    def fetch(self, artist_ids: Iterable[str], markets: Iterable[str] = ("US",)) -> int:
+        """
+        Fetch top tracks for every (artist, market) pair not already held,
+        `max_workers` requests at a time. Returns the number of pairs fetched.
+        """
+        markets = list(dict.fromkeys(m.upper() for m in markets if m))
+        pairs = [(a, m) for a in dict.fromkeys(a for a in artist_ids if a)
+                 for m in markets if (a, m) not in self.results]
+        if not pairs:
+            return 0
+
+        def get(pair):
+            artist_id, market = pair
+            return self.api.get_artist_top_tracks(artist_id, market=market)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for (artist_id, market), data in zip(pairs, pool.map(get, pairs)):
+                self.add(artist_id, market, data)
+        return len(pairs)
+
+    # Reading
+    def track_rows(self, artist_id: str, market: str = "US") -> Optional[array]:
+        return self.results.get((artist_id, market.upper()))
+
+    def top_tracks_df(self, artist_id: str, market: str = "US") -> pd.DataFrame:
+        """Same columns as services.build_top_tracks_df: Track, Album, Popularity, Duration (min)."""
+        df = self.frame([artist_id], [market])
+        return df[["Track", "Album", "Popularity", "Duration (min)"]]
+
+    def frame(self, artist_ids: Iterable[str] = None, markets: Iterable[str] = None) -> pd.DataFrame:
+        """
+        Long DataFrame, one row per (artist, market, rank), built by indexing
+        the shared track table. Columns: MARKET_COLUMNS.
+        """
+        wanted_artists = set(artist_ids) if artist_ids is not None else None
+        wanted_markets = {m.upper() for m in markets} if markets is not None else None
+
+        owners, market_col, ranks, parts = [], [], [], []
+        with self._lock:
+            for (artist_id, market), rows in self.results.items():
+                if wanted_artists is not None and artist_id not in wanted_artists:
+                    continue
+                if wanted_markets is not None and market not in wanted_markets:
+                    continue
+                owners.extend([artist_id] * len(rows))
+                market_col.extend([market] * len(rows))
+                ranks.extend(range(1, len(rows) + 1))
+                parts.append(rows)
+
+            # Copies (not buffer views) so the arrays can keep growing afterwards
+            refs = np.array([r for p in parts for r in p], dtype=np.intp)
+            track_ids = np.array(self.track_ids, dtype=object)
+            track_names = np.array(self.track_names, dtype=object)
+            album_names = np.array(self.album_names, dtype=object)
+            album_rows = np.array(self.track_album, dtype=np.intp)
+            popularity = np.array(self.track_popularity, dtype=np.int32)
+            duration = np.array(self.track_duration_ms, dtype=np.int64)
+
+            return pd.DataFrame({
+                "Artist ID": pd.Categorical(owners),
+                "Market": pd.Categorical(market_col),
+                "Rank": np.asarray(ranks, dtype=np.int16),
+                "Track ID": track_ids[refs],
+                "Track": track_names[refs],
+                "Album": album_names[album_rows[refs]],
+                "Popularity": popularity[refs],
+                "Duration (min)": (duration[refs] // 60000).astype(np.int32),
+            }, columns=MARKET_COLUMNS)
+
+    def stats(self) -> dict:
+        """pairs, unique tracks/albums, references held and how many were shared."""
+        with self._lock:
+            references = sum(len(rows) for rows in self.results.values())
+            return {
+                "pairs": len(self.results),
+                "tracks": len(self.track_ids),
+                "albums": len(self.album_ids),
+                "references": references,
+                "deduplicated": references - len(self.track_ids),
+            }
@@ -0,0 +1,118 @@
+import json
+import sys
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:  # optional faster decoder
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data):
+    """Decode a JSON body (bytes or str); uses orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Records (slotted: no per-instance dict, fields stored inline)
+@dataclass(slots=True)
+class Artist:
+    id: str
+    name: str
+    url: str = ""
+    genres: Tuple[str, ...] = ()
+    followers: int = 0
+    popularity: int = 0
+
+    @classmethod
+    def from_json(cls, artist: dict) -> "Artist":
+        """Raw Spotify artist JSON -> Artist. Genre strings are interned (they repeat a lot)."""
+        return cls(
+            artist.get("id", ""),
+            artist.get("name", ""),
+            (artist.get("external_urls") or {}).get("spotify", ""),
+            tuple(sys.intern(g) for g in artist.get("genres") or ()),
+            int((artist.get("followers") or {}).get("total", 0) or 0),
+            int(artist.get("popularity", 0) or 0),
+        )
+
+    def to_dict(self) -> dict:
+        """The {id, name, url, genres, followers, popularity} dict search_artists returns."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "url": self.url,
+            "genres": list(self.genres),
+            "followers": self.followers,
+            "popularity": self.popularity,
+        }
+
+
+@dataclass(slots=True)
+class Track:
+    id: str
+    name: str
+    album_id: str = ""
+    album: str = ""
+    popularity: int = 0
+    duration_ms: int = 0
+    artist_ids: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_json(cls, track: dict) -> "Track":
+        album = track.get("album") or {}
+        return cls(
+            track.get("id", ""),
+            track.get("name", ""),
+            album.get("id", ""),
+            album.get("name", ""),
+            int(track.get("popularity", 0) or 0),
+            int(track.get("duration_ms") or 0),
+            tuple(a.get("id", "") for a in track.get("artists") or ()),
+        )
+
+    @property
+    def duration_min(self) -> int:
+        """Whole minutes, rounded down."""
+        return self.duration_ms // 60000
+
+
+UNKNOWN_ARTIST = Artist("", "Unknown")
+
+
+def parse_artists(items: Iterable[Optional[dict]]) -> list:
+    """Raw artist JSON list -> Artist records (None stays None)."""
+    return [Artist.from_json(a) if a else None for a in items]
+
+
+def parse_tracks(data: Optional[dict]) -> list:
+    """Top-tracks (or any {"tracks": [...]}) JSON -> Track records."""
+    return [Track.from_json(t) for t in (data or {}).get("tracks", []) or [] if t]
+
+
+# Column-batch DataFrame constructors
+def tracks_df(tracks: Iterable[Track]) -> pd.DataFrame:
+    """Track records -> Track, Album, Popularity, Duration (min) (the top-tracks report)."""
+    tracks = list(tracks)
+    return pd.DataFrame({
+        "Track": [t.name for t in tracks],
+        "Album": [t.album for t in tracks],
+        "Popularity": np.array([t.popularity for t in tracks], dtype=np.int64),
+        "Duration (min)": np.array([t.duration_ms // 60000 for t in tracks], dtype=np.int64),
+    })
+
+
+def artists_df(artists: Iterable[Optional[Artist]]) -> pd.DataFrame:
+    """Artist records (None or no name -> "Unknown") -> Artist, Followers, Popularity, Genres (the comparison report)."""
+    artists = [a or UNKNOWN_ARTIST for a in artists]
+    return pd.DataFrame({
+        "Artist": [a.name or "Unknown" for a in artists],
+        "Followers": np.array([a.followers for a in artists], dtype=np.int64),
+        "Popularity": np.array([a.popularity for a in artists], dtype=np.int64),
+        "Genres": [", ".join(g.title() for g in a.genres) if a.genres else "N/A" for a in artists],
+    })
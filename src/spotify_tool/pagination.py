@@ -0,0 +1,123 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional
+
+from .spotify_api import parse_artist
+
+
+def iter_pages(api, url: str, params: Optional[dict] = None, items_key: Optional[str] = None,
+               prefetch: bool = True, max_items: Optional[int] = None) -> Iterator[dict]:
+    """
+    Yield Spotify paging objects, following each page's `next` link.
+
+    items_key: where the paging object sits in the response ("artists" for
+    /search); None when the response is the paging object itself.
+    With prefetch, the next page is requested in the background while the
+    caller works through the current one. Stopping early is fine.
+    max_items: stop once the pages so far hold this many items (no request,
+    and no prefetch, for a page the caller would not use).
+    """
+    pool = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    pending = None
+    received = 0
+    try:
+        page = api.get(url, params=params) or {}
+        while True:
+            paging = (page.get(items_key) if items_key else page) or {}
+            next_url = paging.get("next")
+            received += sum(1 for item in paging.get("items") or [] if item is not None)
+            if max_items is not None and received >= max_items:
+                next_url = None
+            if next_url and pool is not None:
+                pending = pool.submit(api.get, next_url)
+
+            yield paging
+
+            if not next_url:
+                return
+            page = (pending.result() if pending is not None else api.get(next_url)) or {}
+            pending = None
+    finally:
+        if pool is not None:
+            if pending is not None:
+                pending.cancel()
+            pool.shutdown(wait=False)
+
+
+def iter_items(api, url: str, params: Optional[dict] = None, items_key: Optional[str] = None,
+               max_items: Optional[int] = None, prefetch: bool = True) -> Iterator[dict]:
+    """Yield raw items across all pages (up to max_items)."""
+    if max_items is not None and max_items <= 0:
+        return
+    count = 0
+    for paging in iter_pages(api, url, params, items_key, prefetch, max_items):
+        for item in paging.get("items") or []:
+            if item is None:
+                continue
+            count += 1
+            yield item
+            if max_items is not None and count >= max_items:
+                return
+
+
+# Search
+def iter_search_artists(api, query: str, page_size: int = 50,
+                        max_items: Optional[int] = None) -> Iterator[dict]:
+    """Lazy search_artists over every result page; yields the same parsed dicts."""
+    query = (query or "").strip()
+    if not query:
+        return
+    params = {"q": query, "type": "artist", "limit": min(int(page_size), 50)}
+    for artist in iter_items(api, f"{api.API_BASE}/search", params, "artists", max_items):
+        yield parse_artist(artist)
+
+
+# Catalog
+def iter_artist_albums(api, artist_id: str, include_groups: str = "album,single",
+                       market: Optional[str] = None, page_size: int = 50,
+                       max_items: Optional[int] = None, prefetch: bool = True) -> Iterator[dict]:
+    """Yield an artist's albums: {id, name, album_type, release_date, total_tracks, url, artists}."""
+    if not artist_id:
+        raise ValueError("artist_id is required")
+    params = {"include_groups": include_groups, "limit": min(int(page_size), 50)}
+    if market:
+        params["market"] = market
+    url = f"{api.API_BASE}/artists/{artist_id}/albums"
+    for album in iter_items(api, url, params, max_items=max_items, prefetch=prefetch):
+        yield {
+            "id": album.get("id", ""),
+            "name": album.get("name", ""),
+            "album_type": album.get("album_type", ""),
+            "release_date": album.get("release_date", ""),
+            "total_tracks": int(album.get("total_tracks") or 0),
+            "url": (album.get("external_urls") or {}).get("spotify", ""),
+            "artists": [a.get("id", "") for a in album.get("artists") or []],
+        }
+
+
+def iter_album_tracks(api, album_id: str, market: Optional[str] = None, page_size: int = 50,
+                      max_items: Optional[int] = None) -> Iterator[dict]:
+    """Yield an album's tracks: {id, name, track_number, disc_number, duration_ms, artists}."""
+    if not album_id:
+        raise ValueError("album_id is required")
+    params = {"limit": min(int(page_size), 50)}
+    if market:
+        params["market"] = market
+    url = f"{api.API_BASE}/albums/{album_id}/tracks"
+    for track in iter_items(api, url, params, max_items=max_items):
+        yield {
+            "id": track.get("id", ""),
+            "name": track.get("name", ""),
+            "track_number": int(track.get("track_number") or 0),
+            "disc_number": int(track.get("disc_number") or 0),
+            "duration_ms": int(track.get("duration_ms") or 0),
+            "artists": [a.get("id", "") for a in track.get("artists") or []],
+        }
+
+
+def iter_discography(api, artist_id: str, include_groups: str = "album,single",
+                     market: Optional[str] = None) -> Iterator[dict]:
+    """Every track on every album of an artist, one at a time, tagged with its album."""
+    for album in iter_artist_albums(api, artist_id, include_groups, market):
+        for track in iter_album_tracks(api, album["id"], market):
+            yield {**track, "album_id": album["id"], "album": album["name"],
+                   "release_date": album["release_date"]}
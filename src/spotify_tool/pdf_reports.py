@@ -0,0 +1,154 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+
+from . import services
+from .excel_reports import COMPARISON_COLUMNS, TOP_TRACKS_COLUMNS, safe_name
+from .instrumentation import timed
+
+# Column name -> (width mm, alignment); unknown columns get DEFAULT_COLUMN
+COLUMN_LAYOUT = {
+    "Track": (65, "L"),
+    "Album": (60, "L"),
+    "Popularity": (25, "R"),
+    "Duration (min)": (30, "R"),
+    "Artist": (50, "L"),
+    "Followers": (35, "R"),
+    "Genres": (95, "L"),
+}
+DEFAULT_COLUMN = (40, "L")
+ROW_HEIGHT = 8
+CHARS_PER_MM = 0.5  # Helvetica 10pt, roughly; used to trim long cells without measuring
+
+# Core fonts only cover latin-1; map the usual typographic characters first
+_LATIN1_FALLBACKS = str.maketrans({
+    "‘": "'", "’": "'", "“": '"', "”": '"',
+    "–": "-", "—": "-", "…": "...", " ": " ",
+})
+
+
+def latin1(text) -> str:
+    """Text the built-in PDF fonts can draw (anything else becomes '?')."""
+    return str(text).translate(_LATIN1_FALLBACKS).encode("latin-1", "replace").decode("latin-1")
+
+
+def _cell_text(col: str, value) -> str:
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    if col == "Followers":
+        return f"{int(value):,}"
+    if col == "Duration (min)":
+        return f"{int(value)} min"
+    return latin1(value)
+
+
+def table_columns(df: pd.DataFrame, columns: Sequence[str]) -> Dict[str, list]:
+    """DataFrame -> {column: plain Python list}; what the renderer (and pickling) wants."""
+    return {c: df[c].tolist() if c in df.columns else [] for c in columns}
+
+
+# Rendering (plain lists in, file out; runs in worker processes)
+def render_table_pdf(title: str, data: Dict[str, list], path: str) -> str:
+    """Write a one-table PDF: centred title, bold header repeated on every page."""
+    columns = list(data)
+    layout = [COLUMN_LAYOUT.get(c, DEFAULT_COLUMN) for c in columns]
+    limits = [int(width * CHARS_PER_MM) for width, _ in layout]
+
+    pdf = FPDF(orientation="L" if sum(w for w, _ in layout) > 190 else "P")
+    pdf.set_auto_page_break(False)
+    pdf.add_page()
+    pdf.set_font("helvetica", size=12)
+    pdf.cell(0, 10, latin1(title), align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    def header():
+        pdf.set_font("helvetica", style="B", size=10)
+        for col, (width, _) in zip(columns, layout):
+            pdf.cell(width, ROW_HEIGHT, latin1(col), border=1)
+        pdf.ln(ROW_HEIGHT)
+        pdf.set_font("helvetica", size=10)
+
+    header()
+    bottom = pdf.h - pdf.b_margin
+    for row in zip(*(data[c] for c in columns)):
+        if pdf.get_y() + ROW_HEIGHT > bottom:
+            pdf.add_page()
+            header()
+        for col, value, (width, align), limit in zip(columns, row, layout, limits):
+            pdf.cell(width, ROW_HEIGHT, _cell_text(col, value)[:limit], border=1, align=align)
+        pdf.ln(ROW_HEIGHT)
+
+    pdf.output(path)
+    return path
+
+
+def _render_job(job) -> str:
+    return render_table_pdf(*job)
+
+
+# Single reports
+@timed("write_top_tracks_pdf")
+def write_top_tracks_pdf(df: pd.DataFrame, artist_name: str, path: Optional[str] = None) -> str:
+    """Top-tracks DataFrame (services.build_top_tracks_df) -> top_tracks_<Artist>.pdf."""
+    path = path or f"top_tracks_{safe_name(artist_name) or 'artist'}.pdf"
+    return render_table_pdf(f"Top Tracks for {artist_name}",
+                            table_columns(df, TOP_TRACKS_COLUMNS), path)
+
+
+@timed("write_comparison_pdf")
+def write_comparison_pdf(df: pd.DataFrame, path: str = "artist_comparison_report.pdf",
+                         sort_col: str = "Followers") -> str:
+    """Comparison DataFrame (services.build_comparison_df) -> one PDF table."""
+    return render_table_pdf(f"Comparison of Searched Artists by {sort_col}",
+                            table_columns(df, COMPARISON_COLUMNS), path)
+
+
+# PDF pack (many artists)
+@timed("render_artist_pdfs")
+def render_artist_pdfs(api, artist_ids, out_dir: str = ".", market: str = "US",
+                       fetch_workers: int = 8, render_workers: Optional[int] = None) -> List[str]:
+    """
+    One top-tracks PDF per artist, written to `out_dir`.
+
+    Profiles come from batched /v1/artists calls and top tracks are fetched
+    on `fetch_workers` threads; each artist is handed to a process pool
+    (`render_workers`, default one per core) as soon as its tracks arrive, so
+    rendering runs on every core while the rest is still downloading.
+    Returns the paths written, in input order.
+    """
+    artist_ids = list(dict.fromkeys(a for a in artist_ids if a))
+    if not artist_ids:
+        return []
+    os.makedirs(out_dir, exist_ok=True)
+
+    profiles = [p or {} for p in api.get_artists(artist_ids)]
+    names = [p.get("name") or artist_id for p, artist_id in zip(profiles, artist_ids)]
+
+    # File names decided up front; same-name artists get their ID appended
+    used, paths = set(), []
+    for name, artist_id in zip(names, artist_ids):
+        stem = safe_name(name) or artist_id
+        if stem.lower() in used:
+            stem = f"{stem}_{artist_id}"
+        used.add(stem.lower())
+        paths.append(os.path.join(out_dir, f"top_tracks_{stem}.pdf"))
+
+    def fetch(artist_id):
+        df = services.build_top_tracks_df(api, artist_id, market=market)
+        return df if df.empty else services.sort_top_tracks_df(df)
+
+    # Spawned, not forked: the fetch threads may hold scheduler/cache/urllib3 locks
+    # when the first worker starts, and a forked child would inherit them held
+    spawn = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=render_workers, mp_context=spawn) as renderers, \
+            ThreadPoolExecutor(max_workers=fetch_workers) as fetchers:
+        rendered = [
+            renderers.submit(_render_job, (f"Top Tracks for {name}",
+                                           table_columns(df, TOP_TRACKS_COLUMNS), path))
+            for name, path, df in zip(names, paths, fetchers.map(fetch, artist_ids))
+        ]
+        return [f.result() for f in rendered]
@@ -0,0 +1,130 @@
+import random
+import threading
+import time
+
+import requests
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RequestScheduler:
+    """
+    Shared throttle + retry policy for Spotify requests.
+
+    Every request takes a token from a token bucket (`rate` per second, up to
+    `burst` at once), so all callers that share a scheduler stay under the quota
+    together. Failed attempts are retried:
+      - 429: wait for Retry-After (and pause every caller for that long)
+      - 5xx, timeouts, connection errors: exponential backoff with full jitter
+
+    Pass the same scheduler to several clients to throttle them as one.
+    """
+
+    def __init__(self, rate: float = 20.0, burst: int = 40, max_retries: int = 5,
+                 backoff_base: float = 0.5, backoff_cap: float = 30.0,
+                 max_retry_after: float = 120.0):
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be > 0 (or None to disable throttling)")
+        self.rate = rate
+        self.burst = max(1, int(burst))
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.max_retry_after = max_retry_after
+
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+
+        # Stats
+        self._started = None
+        self._requests = 0
+        self._retries = 0
+        self._rate_limited = 0
+        self._throttled = 0.0
+
+    # Token bucket
+    def acquire(self):
+        """Block until this caller may send one request."""
+        with self._lock:
+            now = time.monotonic()
+            if self._started is None:
+                self._started = now
+            self._requests += 1
+
+            wait = max(0.0, self._paused_until - now)
+            if self.rate is not None:
+                self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+                self._last_refill = now
+                # Reserve a token now (may go negative) and sleep off the debt
+                self._tokens -= 1
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens / self.rate)
+            self._throttled += wait
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold back every caller for `seconds` (used for 429 Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def _retry_after(self, resp) -> float:
+        raw = resp.headers.get("Retry-After")
+        try:
+            seconds = float(raw)
+        except (TypeError, ValueError):
+            seconds = self.backoff_base
+        return min(max(seconds, 0.0), self.max_retry_after)
+
+    # Retry loop
+    def call(self, send, throttle: bool = True):
+        """
+        Run `send()` (returns a requests.Response) with throttling and retries.
+        Returns the last response, with the number of retries it took as
+        `resp.retries`; raises the last network error if every attempt failed.
+        """
+        attempt = 0
+        while True:
+            if throttle:
+                self.acquire()
+            try:
+                resp = send()
+            except (requests.Timeout, requests.ConnectionError):
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                if resp.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    resp.retries = attempt
+                    return resp
+                if resp.status_code == 429:
+                    delay = self._retry_after(resp)
+                    self.pause(delay)
+                    with self._lock:
+                        self._rate_limited += 1
+                else:
+                    delay = self._backoff(attempt)
+
+            attempt += 1
+            with self._lock:
+                self._retries += 1
+                self._throttled += delay
+            time.sleep(delay)
+
+    def stats(self) -> dict:
+        """Counters for tuning: requests, retries, 429s, seconds spent waiting, req/s."""
+        with self._lock:
+            elapsed = time.monotonic() - self._started if self._started else 0.0
+            return {
+                "requests": self._requests,
+                "retries": self._retries,
+                "rate_limited": self._rate_limited,
+                "throttled_seconds": round(self._throttled, 3),
+                "requests_per_second": round(self._requests / elapsed, 2) if elapsed > 0 else 0.0,
+            }
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional
+
+import pandas as pd
+
+CHUNK = 500  # artists per refresh batch (keeps SQLite IN (...) lists small)
+CHANGE_COLUMNS = ["artist_id", "Artist", "change", "old", "new", "delta", "track_id", "track"]
+
+
+class RefreshEngine:
+    """
+    Incremental refresh over a saved-artist set.
+
+    Per artist it keeps the last fetch time, a content hash of the profile +
+    top-track IDs, and the last seen values (SQLite at `path`). refresh()
+    re-fetches only artists older than `max_age` (highest priority first, then
+    most stale), up to `budget`, and returns only what changed:
+      - "followers" / "popularity": old, new, delta
+      - "track_entered": a track new to the artist's top `top_n`
+    Unchanged artists only get their fetch time bumped.
+    """
+
+    def __init__(self, api, path: str = "refresh_state.sqlite", market: str = "US",
+                 top_n: int = 10, max_workers: int = 8):
+        self.api = api
+        self.market = market
+        self.top_n = top_n
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS refresh_state ("
+            " artist_id TEXT PRIMARY KEY, priority INTEGER NOT NULL DEFAULT 0,"
+            " last_fetched REAL, content_hash TEXT, name TEXT,"
+            " followers INTEGER, popularity INTEGER, top_tracks TEXT)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS refresh_due ON refresh_state (priority DESC, last_fetched)"
+        )
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+    # Roster
+    def track(self, artist_ids: Iterable[str], priority: Optional[int] = None):
+        """Add artists to the refresh set (and optionally set their priority)."""
+        ids = [(a,) for a in artist_ids if a]
+        with self._lock:
+            self._db.executemany("INSERT OR IGNORE INTO refresh_state (artist_id) VALUES (?)", ids)
+            if priority is not None:
+                self._db.executemany(
+                    "UPDATE refresh_state SET priority = ? WHERE artist_id = ?",
+                    [(priority, a) for (a,) in ids],
+                )
+            self._db.commit()
+
+    def untrack(self, artist_ids: Iterable[str]):
+        with self._lock:
+            self._db.executemany("DELETE FROM refresh_state WHERE artist_id = ?",
+                                 [(a,) for a in artist_ids])
+            self._db.commit()
+
+    def due(self, max_age: float, budget: Optional[int] = None) -> List[str]:
+        """IDs fetched longer than max_age seconds ago (or never), in refresh order."""
+        cutoff = time.time() - max_age
+        sql = ("SELECT artist_id FROM refresh_state"
+               " WHERE last_fetched IS NULL OR last_fetched < ?"
+               " ORDER BY priority DESC, last_fetched IS NOT NULL, last_fetched")
+        args = [cutoff]
+        if budget is not None:
+            sql += " LIMIT ?"
+            args.append(int(budget))
+        with self._lock:
+            return [row[0] for row in self._db.execute(sql, args)]
+
+    # Refresh
+    def refresh(self, max_age: float = 3600, budget: Optional[int] = None,
+                include_tracks: bool = True) -> List[dict]:
+        """Re-fetch due artists and return change rows (see CHANGE_COLUMNS)."""
+        changes = []
+        due = self.due(max_age, budget)
+        for start in range(0, len(due), CHUNK):
+            changes.extend(self._refresh_chunk(due[start:start + CHUNK], include_tracks))
+        return changes
+
+    def _refresh_chunk(self, ids, include_tracks):
+        profiles = self.api.get_artists(ids)
+        top = [None] * len(ids)
+        if include_tracks:
+            # Only artists that still exist; unknown IDs would 404 here
+            found = [pos for pos, profile in enumerate(profiles) if profile]
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                for pos, tracks in zip(found, pool.map(self._top_track_ids, [ids[p] for p in found])):
+                    top[pos] = tracks
+
+        placeholders = ",".join("?" * len(ids))
+        with self._lock:
+            previous = {
+                row[0]: row[1:] for row in self._db.execute(
+                    "SELECT artist_id, content_hash, followers, popularity, top_tracks"
+                    f" FROM refresh_state WHERE artist_id IN ({placeholders})", ids)
+            }
+
+        now = time.time()
+        changes, updates, missing = [], [], []
+        for artist_id, profile, tracks in zip(ids, profiles, top):
+            if not profile:
+                # Deleted/unknown ID: count it as fetched so it waits max_age like the rest
+                missing.append((now, artist_id))
+                continue
+            name = profile.get("name", "")
+            followers = int((profile.get("followers") or {}).get("total", 0))
+            popularity = int(profile.get("popularity", 0))
+            old_hash, old_followers, old_popularity, old_tracks = previous.get(artist_id, (None,) * 4)
+            if tracks is None:
+                # Profile-only refresh: keep the last known top tracks
+                tracks = json.loads(old_tracks) if old_tracks else []
+
+            digest = _content_hash(name, followers, popularity, profile.get("genres") or [],
+                                   [t for t, _ in tracks])
+            updates.append((now, digest, name, followers, popularity, json.dumps(tracks), artist_id))
+            if digest == old_hash or old_hash is None:
+                # Unchanged, or first sighting (nothing to diff against yet)
+                continue
+
+            for field, old, new in (("followers", old_followers, followers),
+                                    ("popularity", old_popularity, popularity)):
+                if old is not None and old != new:
+                    changes.append(_change(artist_id, name, field, old, new, new - old))
+            seen = {t for t, _ in json.loads(old_tracks)} if old_tracks else set()
+            for track_id, track in tracks:
+                if track_id not in seen:
+                    changes.append(_change(artist_id, name, "track_entered",
+                                           track_id=track_id, track=track))
+
+        with self._lock:
+            self._db.executemany(
+                "UPDATE refresh_state SET last_fetched = ?, content_hash = ?, name = ?,"
+                " followers = ?, popularity = ?, top_tracks = ? WHERE artist_id = ?", updates)
+            self._db.executemany("UPDATE refresh_state SET last_fetched = ? WHERE artist_id = ?", missing)
+            self._db.commit()
+        return changes
+
+    def _top_track_ids(self, artist_id):
+        data = self.api.get_artist_top_tracks(artist_id, market=self.market)
+        tracks = (data or {}).get("tracks", []) or []
+        return [[t.get("id", ""), t.get("name", "")] for t in tracks[:self.top_n]]
+
+
+def changes_df(changes: List[dict]) -> pd.DataFrame:
+    """Change rows from RefreshEngine.refresh as a DataFrame."""
+    return pd.DataFrame(changes, columns=CHANGE_COLUMNS)
+
+
+def _change(artist_id, name, change, old=None, new=None, delta=None, track_id=None, track=None):
+    return {"artist_id": artist_id, "Artist": name, "change": change, "old": old, "new": new,
+            "delta": delta, "track_id": track_id, "track": track}
+
+
+def _content_hash(name, followers, popularity, genres, track_ids) -> str:
+    payload = json.dumps([name, followers, popularity, sorted(genres), track_ids])
+    return hashlib.sha1(payload.encode()).hexdigest()
@@ -0,0 +1,158 @@
+import re
+import sqlite3
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from . import services
+
+
+def normalize_name(name: str) -> str:
+    """
+    Fold an artist name for matching: strip accents, casefold, '&' -> 'and',
+    drop punctuation and a leading 'the', collapse whitespace.
+    'Beyoncé' -> 'beyonce', 'The Black Keys' -> 'black keys'.
+    """
+    text = unicodedata.normalize("NFKD", name or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    text = text.replace("&", " and ")
+    text = re.sub(r"[^\w\s]+", " ", text)
+    text = " ".join(text.split())
+    if text.startswith("the ") and len(text) > 4:
+        text = text[4:]
+    return text
+
+
+def trigrams(norm: str) -> set:
+    padded = f"  {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class AliasIndex:
+    """
+    Persistent normalized-name/alias -> artist ID index with trigram fuzzy lookup.
+
+    Backed by SQLite at `path` (":memory:" for a throwaway index). Every alias
+    is stored normalized along with its trigrams, so fuzzy() only scores the
+    aliases that share trigrams with the query.
+    """
+
+    def __init__(self, path: str = "artist_aliases.sqlite"):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS aliases ("
+            " alias TEXT PRIMARY KEY, artist_id TEXT NOT NULL, name TEXT, gram_count INTEGER NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS alias_grams (gram TEXT NOT NULL, alias TEXT NOT NULL,"
+            " PRIMARY KEY (gram, alias)) WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS aliases_artist ON aliases (artist_id);"
+        )
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM aliases").fetchone()[0]
+
+    def add(self, alias: str, artist_id: str, name: Optional[str] = None):
+        self.add_many([(alias, artist_id, name)])
+
+    def add_many(self, entries: Iterable):
+        """Learn (alias, artist_id, display_name) triples; later entries win."""
+        alias_rows, gram_rows = [], []
+        for alias, artist_id, name in entries:
+            norm = normalize_name(alias)
+            if not norm or not artist_id:
+                continue
+            grams = trigrams(norm)
+            alias_rows.append((norm, artist_id, name or alias, len(grams)))
+            gram_rows.extend((g, norm) for g in grams)
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO aliases VALUES (?, ?, ?, ?)", alias_rows)
+            self._db.executemany("INSERT OR IGNORE INTO alias_grams VALUES (?, ?)", gram_rows)
+            self._db.commit()
+
+    def lookup(self, name: str) -> Optional[dict]:
+        """Exact match on the normalized name -> {"id", "name"} or None."""
+        with self._lock:
+            row = self._db.execute("SELECT artist_id, name FROM aliases WHERE alias = ?",
+                                   (normalize_name(name),)).fetchone()
+        return {"id": row[0], "name": row[1]} if row else None
+
+    def fuzzy(self, name: str, min_score: float = 0.6, limit: int = 5) -> List[dict]:
+        """Aliases ranked by trigram Jaccard similarity >= min_score."""
+        grams = trigrams(normalize_name(name))
+        if not grams:
+            return []
+        marks = ",".join("?" * len(grams))
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT a.alias, a.artist_id, a.name, a.gram_count, COUNT(*) AS shared"
+                " FROM alias_grams g JOIN aliases a ON a.alias = g.alias"
+                f" WHERE g.gram IN ({marks}) GROUP BY a.alias"
+                " ORDER BY shared DESC LIMIT ?", (*grams, limit * 10),
+            ).fetchall()
+        out = []
+        for alias, artist_id, display, count, shared in rows:
+            score = shared / (len(grams) + count - shared)
+            if score >= min_score:
+                out.append({"id": artist_id, "name": display, "alias": alias, "score": round(score, 3)})
+        out.sort(key=lambda r: r["score"], reverse=True)
+        return out[:limit]
+
+
+def resolve_names(api, names: Iterable[str], index: Optional[AliasIndex] = None,
+                  max_workers: int = 8, min_score: float = 0.7, margin: float = 0.05,
+                  learn: bool = True) -> Dict[str, dict]:
+    """
+    Map many artist names to Spotify IDs, locally first.
+
+    1. exact normalized match in `index`
+    2. trigram fuzzy match scoring >= min_score and beating any other
+       artist's alias by `margin` (ambiguous names go to the API)
+    3. the rest go to concurrent API searches (services.find_best_artist),
+       whose answers are learned back into the index
+    Returns {name: {"id", "name", "source": "exact"|"fuzzy"|"api"|"none", "score"}}.
+    """
+    index = index or AliasIndex(":memory:")
+    names = list(dict.fromkeys(n for n in names if n and n.strip()))
+
+    results, pending = {}, []
+    for name in names:
+        hit = index.lookup(name)
+        if hit:
+            results[name] = {**hit, "source": "exact", "score": 1.0}
+            continue
+        candidates = index.fuzzy(name, min_score=min_score, limit=5)
+        rivals = [c for c in candidates[1:] if candidates and c["id"] != candidates[0]["id"]]
+        if candidates and (not rivals or candidates[0]["score"] - rivals[0]["score"] >= margin):
+            best = candidates[0]
+            results[name] = {"id": best["id"], "name": best["name"], "source": "fuzzy", "score": best["score"]}
+        else:
+            pending.append(name)
+
+    # One API search per distinct normalized name
+    by_norm = {}
+    for name in pending:
+        by_norm.setdefault(normalize_name(name), []).append(name)
+    queries = [group[0] for group in by_norm.values()]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        found = list(pool.map(lambda q: services.find_best_artist(api, q), queries))
+
+    learned = []
+    for query, artist in zip(queries, found):
+        for name in by_norm[normalize_name(query)]:
+            if artist:
+                results[name] = {"id": artist["id"], "name": artist["name"], "source": "api", "score": None}
+            else:
+                results[name] = {"id": None, "name": None, "source": "none", "score": None}
+        if artist:
+            learned.append((query, artist["id"], artist["name"]))
+            learned.append((artist["name"], artist["id"], artist["name"]))
+    if learn and learned:
+        index.add_many(learned)
+
+    return {name: results[name] for name in names}
@@ -1,6 +1,11 @@
 from typing import Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import sys
 import pandas as pd
-import re
+
+from . import excel_reports, models
+from .instrumentation import span, timed
 
 def find_best_artist(api, query: str, limit: int = 5) -> Optional[Dict]:
     """
@@ -21,36 +26,27 @@ def find_best_artist(api, query: str, limit: int = 5) -> Optional[Dict]:
     exact = next((a for a in items if a.get("name", "").lower() == query.strip().lower()), None)
     artist = exact or max(items, key=lambda a: a.get("popularity", 0))
 
-    return {
-        "id": artist["id"],
-        "name": artist["name"],
-        "followers": artist.get("followers", {}).get("total", 0),
-        "popularity": artist.get("popularity", 0),
-        "genres": artist.get("genres", []),
-        "url": artist.get("external_urls", {}).get("spotify", "")
-    }
+    return models.Artist.from_json(artist).to_dict()
 
 
 # Top Tracks (Per Artist)
-def build_top_tracks_df(api, artist_id: str, market: str = "US"):
+@timed("build_top_tracks")
+def build_top_tracks_df(api, artist_id: str, market: str = "US", snapshots=None):
+    """Top tracks DataFrame; also appends the raw list to `snapshots` (SnapshotStore) if given."""
     if not artist_id:
         if not artist_id:
             raise ValueError("artist_id is required")
 
     data = api.get_artist_top_tracks(artist_id, market=market)
-    tracks = (data or {}).get("tracks", []) or []
-
-    rows = []
-    for t in tracks:
-        rows.append({
-            "Track": t.get("name", ""),
-            "Album": (t.get("album") or {}).get("name", ""),
-            "Popularity": int(t.get("popularity", 0)),
-            "Duration (min)": int(t.get("duration_ms") or 0 // 60000),
-        })
+    if snapshots is not None:
+        snapshots.record_top_tracks(artist_id, data, market=market)
+    return _top_tracks_df(data)
 
-    return pd.DataFrame(rows)
+def _top_tracks_df(data) -> pd.DataFrame:
+    """Top-tracks JSON -> DataFrame with Track, Album, Popularity, Duration (min)."""
+    return models.tracks_df(models.parse_tracks(data))
 
+@timed("sort_top_tracks")
 def sort_top_tracks_df(df: pd.DataFrame, sort_col: str = "Popularity", ascending: bool = False) -> pd.DataFrame:
     """Sort the top-tracks DataFrame by a supported column."""
     allowed = {"Track", "Album", "Popularity", "Duration (min)"}
@@ -58,70 +54,40 @@ def sort_top_tracks_df(df: pd.DataFrame, sort_col: str = "Popularity", ascending
         sort_col = "Popularity"
     return df.sort_values(by=sort_col, ascending=ascending, ignore_index=True)
 
+@timed("write_top_tracks")
 def write_top_tracks_excel(df: pd.DataFrame, artist_name):
     """Write an artist's top tracks DataFrame to an Excel file with simple formatting."""
     if df.empty:
-        print("No tracks found.")
+        print("No tracks found.", file=sys.stderr)
         return
 
-    # File name: replace spaces with underscores
-    safe_name = re.sub(r'[^A-Za-z0-9._-]+', "_", artist_name).strip("_")
-    path = f"top_tracks_{safe_name}.xlsx"
-
-
-    with pd.ExcelWriter(path, engine="xlsxwriter") as xw:
-        df.to_excel(xw, sheet_name="TopTracks", index=False)
-        ws = xw.sheets["TopTracks"]
-
-        # Formats
-        header_fmt = xw.book.add_format({"bold": True})
-        int_fmt = xw.book.add_format({"num_format": "0"})
-
-        # Bold header row
-        for col_idx, col_name in enumerate(df.columns):
-            ws.write(0, col_idx, col_name, header_fmt)
+    # Stream rows straight from the frame (no to_excel copy, no header rewrite)
+    return excel_reports.stream_top_tracks_excel(
+        df.itertuples(index=False, name=None), artist_name, columns=list(df.columns)
+    )
 
-        # Set reasonable column widths + formats
-        ws.set_column(0, 0, 30)  # Track
-        ws.set_column(1, 1, 30)  # Album
-        ws.set_column(2, 2, 11, int_fmt)  # Popularity
-        ws.set_column(3, 3, 14, int_fmt)  # Duration (min)
 
-        # Freeze header row & add filter
-        ws.freeze_panes(1, 0)
-        ws.autofilter(0, 0, len(df), len(df.columns) - 1)
+# Artist Comparison
+@timed("build_comparison")
+def build_comparison_df(api, searched_artists, snapshots=None):
+    """
+    Returns pd.DataFrame with columns Artist, Followers, Popularity, Genres.
+    Fetched profiles are also appended to `snapshots` (SnapshotStore) if given.
+    """
+    ids = [a["id"] for a in searched_artists]
 
-    print(f"Saved: {path}")
-    return path
+    # One /v1/artists?ids= call per 50 artists; results keep input order
+    profiles = api.get_artists(ids)
+    if snapshots is not None:
+        snapshots.record_artists(profiles)
 
+    return _comparison_df(profiles)
 
-# Artist Comparison
-def build_comparison_df(api, searched_artists):
-    """Returns pd.DataFrame with columns Artist, Followers, Popularity, Genres."""
-    rows = []
-    for a in searched_artists:
-        artist_id = a["id"]
-
-        # Call Spotify API for artist profile
-        url = f"https://api.spotify.com/v1/artists/{artist_id}"
-        data = api.get(url) or {}
-
-        # Extract fields
-        name = data.get("name", "Unknown")
-        followers = int(data.get("followers", {}).get("total", 0))
-        popularity = int(data.get("popularity", 0))
-        genres_list = data.get("genres", []) or []
-
-        # Build rows
-        rows.append({
-            "Artist": name,
-            "Followers": followers,
-            "Popularity": popularity,
-            "Genres": ", ".join(g.title() for g in genres_list) if genres_list else "N/A"
-        })
-
-    return pd.DataFrame(rows)
+def _comparison_df(profiles) -> pd.DataFrame:
+    """Raw artist profiles (None for unknown) -> comparison DataFrame."""
+    return models.artists_df(models.parse_artists(profiles))
 
+@timed("sort_comparison")
 def sort_comparison_df(df, sort_col="Followers", ascending=False):
     """Sort the DataFrame by Followers or Popularity."""
     if sort_col not in {"Followers", "Popularity"}:
@@ -130,6 +96,7 @@ def sort_comparison_df(df, sort_col="Followers", ascending=False):
     df = df.sort_values(by=sort_col, ascending=ascending, ignore_index=True)
     return df
 
+@timed("write_comparison")
 def write_comparison_excel(df: pd.DataFrame, path: str = "artist_comparison.xlsx") -> str:
     """
     Write the multi-artist comparison DataFrame to an Excel file with light formatting.
@@ -137,39 +104,90 @@ def write_comparison_excel(df: pd.DataFrame, path: str = "artist_comparison.xlsx
     Returns the path written.
     """
     if df is None or df.empty:
-        print("No data to write.")
+        print("No data to write.", file=sys.stderr)
+        return path
+
+    return excel_reports.stream_comparison_excel(
+        df.itertuples(index=False, name=None), path, columns=list(df.columns)
+    )
+
+
+# Roster Workbook (many artists, one file)
+@timed("write_roster_workbook")
+def write_roster_workbook(api, artist_ids, path: str = "roster_top_tracks.xlsx",
+                          market: str = "US", max_workers: int = 8) -> str:
+    """
+    Write one workbook with a Summary sheet plus a TopTracks-style sheet per artist.
+
+    Profiles come from batched /v1/artists calls; top tracks are fetched on
+    `max_workers` threads and each artist sheet is streamed as soon as its
+    tracks arrive (in input order). Returns the path written.
+    """
+    artist_ids = list(dict.fromkeys(a for a in artist_ids if a))
+    if not artist_ids:
+        print("No artists to export.", file=sys.stderr)
         return path
 
-    with pd.ExcelWriter(path, engine="xlsxwriter") as xw:
-        df.to_excel(xw, sheet_name="Comparison", index=False)
-        ws = xw.sheets["Comparison"]
-
-        # Formats
-        header_fmt = xw.book.add_format({"bold": True})
-        num_fmt = xw.book.add_format({"num_format": "#,##0"})  # comma thousands
-
-        # Bold header row
-        for col_idx, col_name in enumerate(df.columns):
-            ws.write(0, col_idx, col_name, header_fmt)
-
-        # Column widths + number format for Followers (if present)
-        cols = list(df.columns)
-        if "Artist" in cols:
-            ws.set_column(cols.index("Artist"), cols.index("Artist"), 22)
-        if "Followers" in cols:
-            idx = cols.index("Followers")
-            ws.set_column(idx, idx, 14, num_fmt)
-        if "Popularity" in cols:
-            idx = cols.index("Popularity")
-            ws.set_column(idx, idx, 11)
-        if "Genres" in cols:
-            idx = cols.index("Genres")
-            ws.set_column(idx, idx, 40)
-
-        # Freeze header row & add filter
-        ws.freeze_panes(1, 0)
-        ws.autofilter(0, 0, len(df), len(df.columns) - 1)
-
-    print(f"Saved: {path}")
+    profiles = [p or {} for p in api.get_artists(artist_ids)]
+
+    # Sheet names decided up front so the summary can point at them
+    used = {"summary"}
+    names = [p.get("name") or artist_id for p, artist_id in zip(profiles, artist_ids)]
+    sheets = [excel_reports.unique_sheet_name(n, used) for n in names]
+
+    def fetch(artist_id):
+        with span("build_top_tracks"):
+            df = _top_tracks_df(api.get_artist_top_tracks(artist_id, market=market))
+        return df if df.empty else sort_top_tracks_df(df)
+
+    book = excel_reports.open_workbook(path)
+    formats = excel_reports.SheetFormats(book)
+    try:
+        # Summary is created first so it is the first tab; its rows are written last
+        summary_ws = excel_reports.add_sheet(book, "Summary", excel_reports.SUMMARY_COLUMNS, formats)
+
+        track_counts = []
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for sheet, df in zip(sheets, pool.map(fetch, artist_ids)):
+                track_counts.append(excel_reports.write_rows_sheet(
+                    book, sheet, excel_reports.TOP_TRACKS_COLUMNS,
+                    df.itertuples(index=False, name=None), formats,
+                ))
+
+        summary = _comparison_df(profiles)
+        summary["Top Tracks"] = track_counts
+        summary["Sheet"] = sheets
+        excel_reports.write_rows(summary_ws, excel_reports.SUMMARY_COLUMNS,
+                                 summary.itertuples(index=False, name=None))
+    finally:
+        book.close()
+
+    print(f"Saved: {path}", file=sys.stderr)
     return path
 
+
+# Async fan-out (AsyncSpotifyAPI)
+async def build_top_tracks_df_async(api, artist_id: str, market: str = "US") -> pd.DataFrame:
+    """Async build_top_tracks_df for an AsyncSpotifyAPI client."""
+    if not artist_id:
+        raise ValueError("artist_id is required")
+
+    data = await api.get_artist_top_tracks(artist_id, market=market)
+    return _top_tracks_df(data)
+
+@timed("build_top_tracks_async")
+async def build_top_tracks_dfs_async(api, artist_ids, market: str = "US") -> Dict[str, pd.DataFrame]:
+    """
+    Build top-tracks DataFrames for many artists at once.
+    Requests fan out up to the client's concurrency limit.
+    Returns {artist_id: DataFrame} in input order.
+    """
+    artist_ids = list(dict.fromkeys(artist_ids))
+    frames = await asyncio.gather(*(build_top_tracks_df_async(api, a, market=market) for a in artist_ids))
+    return dict(zip(artist_ids, frames))
+
+@timed("build_comparison_async")
+async def build_comparison_df_async(api, searched_artists) -> pd.DataFrame:
+    """Async build_comparison_df; the 50-ID chunks are fetched concurrently."""
+    profiles = await api.get_artists([a["id"] for a in searched_artists])
+    return _comparison_df(profiles)
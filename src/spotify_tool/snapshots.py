@@ -0,0 +1,213 @@
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Sequence
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # optional: pip install "spotify-tool[snapshots]"
+    pa = None
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError('Snapshots need pyarrow: pip install "spotify-tool[snapshots]"')
+
+
+def _schemas():
+    text = pa.dictionary(pa.int32(), pa.string())  # -> pandas categorical
+    stamp = pa.timestamp("ms", tz="UTC")
+    return {
+        "artists": pa.schema([
+            ("snapshot_at", stamp),
+            ("artist_id", text),
+            ("name", text),
+            ("followers", pa.int64()),
+            ("popularity", pa.int32()),
+            ("genres", text),
+        ]),
+        "top_tracks": pa.schema([
+            ("snapshot_at", stamp),
+            ("artist_id", text),
+            ("market", text),
+            ("rank", pa.int16()),
+            ("track_id", pa.string()),
+            ("track", text),
+            ("album", text),
+            ("popularity", pa.int32()),
+            ("duration_ms", pa.int32()),
+        ]),
+    }
+
+
+class SnapshotStore:
+    """
+    Append-only columnar history of artist profiles and top-track lists.
+
+    Layout: <root>/<table>/date=YYYY-MM-DD/part-*.arrow (Arrow IPC files,
+    uncompressed so reads can memory-map them). Tables: "artists", "top_tracks".
+
+    Rows are buffered and written one file per (table, date) on flush(), which
+    also runs automatically every `flush_rows` rows and on close().
+    """
+
+    def __init__(self, root: str = "snapshots", flush_rows: int = 50_000):
+        _require_pyarrow()
+        self.root = root
+        self.flush_rows = flush_rows
+        self.schemas = _schemas()
+        self._buffers = {name: [] for name in self.schemas}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Recording
+    def record_artists(self, profiles: Iterable, at: Optional[float] = None):
+        """Buffer raw artist profile JSON (None entries are skipped)."""
+        stamp = _stamp(at)
+        buf = self._buffers["artists"]
+        for p in profiles:
+            if not p:
+                continue
+            buf.append((
+                stamp,
+                p.get("id", ""),
+                p.get("name", ""),
+                int((p.get("followers") or {}).get("total", 0)),
+                int(p.get("popularity", 0)),
+                ", ".join(p.get("genres") or []),
+            ))
+        self._maybe_flush()
+
+    def record_top_tracks(self, artist_id: str, data, market: str = "US", at: Optional[float] = None):
+        """Buffer one artist's raw top-tracks JSON with each track's rank."""
+        stamp = _stamp(at)
+        buf = self._buffers["top_tracks"]
+        for rank, t in enumerate((data or {}).get("tracks", []) or [], start=1):
+            buf.append((
+                stamp,
+                artist_id,
+                market,
+                rank,
+                t.get("id", ""),
+                t.get("name", ""),
+                (t.get("album") or {}).get("name", ""),
+                int(t.get("popularity", 0)),
+                int(t.get("duration_ms") or 0),
+            ))
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if sum(len(b) for b in self._buffers.values()) >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        """Write buffered rows to one new file per table and snapshot date."""
+        for table, rows in self._buffers.items():
+            if not rows:
+                continue
+            schema = self.schemas[table]
+            by_date = {}
+            for row in rows:
+                by_date.setdefault(row[0].strftime("%Y-%m-%d"), []).append(row)
+            for date, part in by_date.items():
+                columns = list(zip(*part))
+                batch = pa.record_batch([_column(col, f) for col, f in zip(columns, schema)],
+                                        schema=schema)
+                directory = os.path.join(self.root, table, f"date={date}")
+                os.makedirs(directory, exist_ok=True)
+                name = f"part-{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}.arrow"
+                tmp = os.path.join(directory, "." + name)
+                with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+                    writer.write_batch(batch)
+                os.replace(tmp, os.path.join(directory, name))
+            rows.clear()
+
+    def close(self):
+        self.flush()
+
+    # Queries
+    def _partitions(self, table: str, start: Optional[str], end: Optional[str]):
+        base = os.path.join(self.root, table)
+        if not os.path.isdir(base):
+            return []
+        paths = []
+        for entry in sorted(os.listdir(base)):
+            if not entry.startswith("date="):
+                continue
+            date = entry[5:]
+            if (start and date < start) or (end and date > end):
+                continue
+            directory = os.path.join(base, entry)
+            paths.extend(os.path.join(directory, f) for f in sorted(os.listdir(directory))
+                         if f.endswith(".arrow") and not f.startswith("."))
+        return paths
+
+    def scan(self, table: str, columns: Optional[Sequence[str]] = None,
+             start: Optional[str] = None, end: Optional[str] = None,
+             artist_ids: Optional[Sequence[str]] = None):
+        """
+        Load a table as a pyarrow.Table, reading only date partitions in
+        [start, end] (YYYY-MM-DD) and only `columns`. Files are memory-mapped,
+        so unselected columns are never paged in.
+        """
+        if table not in self.schemas:
+            raise ValueError(f"unknown table: {table}")
+        schema = self.schemas[table]
+        wanted = list(columns) if columns else schema.names
+
+        tables = []
+        for path in self._partitions(table, start, end):
+            source = pa.memory_map(path, "r")
+            tbl = pa.ipc.open_file(source).read_all()
+            if artist_ids is not None:
+                tbl = tbl.filter(pc.is_in(pc.cast(tbl["artist_id"], pa.string()),
+                                          value_set=pa.array(list(artist_ids), pa.string())))
+            tables.append(tbl.select(wanted))
+        if not tables:
+            return pa.schema([schema.field(c) for c in wanted]).empty_table()
+        return pa.concat_tables(tables)
+
+    def load(self, table: str, columns: Optional[Sequence[str]] = None,
+             start: Optional[str] = None, end: Optional[str] = None,
+             artist_ids: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """scan() as a DataFrame (dictionary columns become categoricals)."""
+        return self.scan(table, columns, start, end, artist_ids).to_pandas()
+
+    def comparison_df(self, date: Optional[str] = None) -> pd.DataFrame:
+        """
+        Offline build_comparison_df: latest snapshot per artist up to `date`.
+        Columns: Artist, Followers, Popularity, Genres.
+        """
+        df = self.load("artists", end=date)
+        if df.empty:
+            return pd.DataFrame(columns=["Artist", "Followers", "Popularity", "Genres"])
+        latest = df.sort_values("snapshot_at").drop_duplicates("artist_id", keep="last")
+        out = latest.rename(columns={"name": "Artist", "followers": "Followers",
+                                     "popularity": "Popularity", "genres": "Genres"})
+        out["Genres"] = out["Genres"].astype(str).str.title().replace("", "N/A")
+        return out[["Artist", "Followers", "Popularity", "Genres"]].reset_index(drop=True)
+
+    def trend_df(self, artist_ids: Sequence[str], start: Optional[str] = None,
+                 end: Optional[str] = None) -> pd.DataFrame:
+        """Follower/popularity history for some artists, one row per snapshot."""
+        df = self.load("artists", ["snapshot_at", "artist_id", "name", "followers", "popularity"],
+                       start, end, artist_ids)
+        return df.sort_values(["artist_id", "snapshot_at"], ignore_index=True)
+
+
+def _column(values, field):
+    if pa.types.is_dictionary(field.type):
+        return pa.array(values, type=field.type.value_type).dictionary_encode()
+    return pa.array(values, type=field.type)
+
+
+def _stamp(at: Optional[float]) -> datetime:
+    return datetime.fromtimestamp(time.time() if at is None else at, tz=timezone.utc)
@@ -1,29 +1,241 @@
-import requests, time
+import re
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .instrumentation import current as current_instrumentation
+from .models import Artist, loads
+from .ratelimit import RequestScheduler
+
+
+_ID_PARENTS = {"artists", "albums", "tracks", "playlists", "shows", "episodes", "users"}
+
+
+def endpoint_template(url: str) -> str:
+    """
+    Collapse a request URL to its endpoint template, for TTLs and metrics.
+    e.g. https://api.spotify.com/v1/artists/4tZ.../top-tracks -> /artists/{id}/top-tracks
+    """
+    parts = [p for p in urlparse(url).path.split("/") if p]
+    if parts and re.fullmatch(r"v\d+", parts[0]):
+        parts = parts[1:]
+    out = []
+    for i, part in enumerate(parts):
+        out.append("{id}" if i and parts[i - 1] in _ID_PARENTS else part)
+    return "/" + "/".join(out)
+
+
+def parse_artist(artist: dict) -> dict:
+    """Raw artist JSON -> {id, name, url, genres, followers, popularity}."""
+    return {
+        "id": artist.get("id", ""),
+        "name": artist.get("name", ""),
+        "url": (artist.get("external_urls") or {}).get("spotify", ""),
+        "genres": artist.get("genres", []) or [],
+        "followers": int((artist.get("followers") or {}).get("total", 0)),
+        "popularity": int(artist.get("popularity", 0)),
+    }
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter that counts every new socket its pools open."""
+
+    def __init__(self, *args, **kwargs):
+        self.connections_opened = 0
+        self._count_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def _connected(self):
+        with self._count_lock:
+            self.connections_opened += 1
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        adapter = self
+
+        def counting(pool_cls):
+            class Conn(pool_cls.ConnectionCls):
+                def connect(self):
+                    adapter._connected()
+                    return super().connect()
+
+            return type(pool_cls.__name__, (pool_cls,), {"ConnectionCls": Conn})
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": counting(HTTPConnectionPool),
+            "https": counting(HTTPSConnectionPool),
+        }
+
 
 class SpotifyAPI:
-    def __init__(self, client_id, client_secret):
+    API_BASE = "https://api.spotify.com/v1"
+    TOKEN_URL = "https://accounts.spotify.com/api/token"
+    MAX_IDS_PER_REQUEST = 50
+
+    def __init__(self, client_id, client_secret, pool_connections=4, pool_maxsize=10,
+                 pool_block=False, keep_alive=True, timeout=20, scheduler=None, cache=None,
+                 token_cache=None, refresh_margin=60, api_base=None, token_url=None,
+                 instrumentation=None):
+        """
+        Spotify client backed by one pooled keep-alive HTTP session.
+
+        pool_connections: number of per-host pools kept (api + accounts hosts).
+        pool_maxsize:     max connections kept open per host.
+        pool_block:       if True, never open more than pool_maxsize connections
+                          per host; extra callers wait for a free one.
+        keep_alive:       if False, send "Connection: close" on every request.
+        scheduler:        RequestScheduler for throttling/retries; share one
+                          instance between clients to throttle them together.
+        cache:            optional ResponseCache consulted before every GET.
+        token_cache:      optional FileTokenCache to share one token across processes.
+        refresh_margin:   refresh the token this many seconds before it expires.
+        api_base, token_url: override the Spotify endpoints (e.g. a local stand-in server).
+        instrumentation:  Instrumentation that receives per-request events; defaults
+                          to the process-wide one from instrumentation.install().
+        """
         self.client_id = client_id
         self.client_secret = client_secret
+        if api_base:
+            self.API_BASE = api_base.rstrip("/")
+        if token_url:
+            self.TOKEN_URL = token_url
         self.access_token = None
         self.expires_at = 0
+        self.refresh_margin = refresh_margin
+        self.token_cache = token_cache
+        self._token_lock = threading.Lock()
+        self._rejected_token = None
+        self.timeout = timeout
+        self.scheduler = scheduler or RequestScheduler()
+        self.cache = cache
+        self.instrumentation = instrumentation
+
+        # One session for every call (search, top-tracks, artists, token)
+        adapter = _CountingAdapter(pool_connections=pool_connections,
+                                   pool_maxsize=pool_maxsize,
+                                   pool_block=pool_block)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+        self._adapter = adapter
+        self._stats_lock = threading.Lock()
+        self.requests_sent = 0
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _send(self, method, url, **kwargs):
+        """Send one request through the pooled session and count it."""
+        kwargs.setdefault("timeout", self.timeout)
+        with self._stats_lock:
+            self.requests_sent += 1
+        return self.session.request(method, url, **kwargs)
+
+    def _instrumentation(self):
+        return self.instrumentation if self.instrumentation is not None else current_instrumentation()
+
+    def _call(self, send, url, method="GET", throttle=True, inst=None):
+        """scheduler.call(send), reported to `inst` (endpoint, status, bytes, latency, retries)."""
+        if inst is None:
+            return self.scheduler.call(send, throttle=throttle)
+
+        event = {"endpoint": endpoint_template(url), "method": method, "cached": False}
+        inst.request_started(event)
+        start = time.perf_counter()
+        resp = None
+        try:
+            resp = self.scheduler.call(send, throttle=throttle)
+            return resp
+        finally:
+            event["latency"] = time.perf_counter() - start
+            if resp is None:
+                event.update(status="error", bytes=0, retries=0)
+            else:
+                event.update(status=resp.status_code, bytes=len(resp.content),
+                             retries=getattr(resp, "retries", 0))
+            inst.request_finished(event)
+
+    def connection_stats(self):
+        """
+        Connection reuse counters.
+
+        Returns {"requests_sent": int, "connections_opened": int}. With keep-alive
+        working, connections_opened stays close to the number of hosts contacted
+        while requests_sent keeps growing.
+        """
+        with self._stats_lock:
+            sent = self.requests_sent
+        return {"requests_sent": sent, "connections_opened": self._adapter.connections_opened}
+
+    def _token_valid(self, token, expires_at, margin=None):
+        margin = self.refresh_margin if margin is None else margin
+        return bool(token) and token != self._rejected_token and time.time() < expires_at - margin
 
     def _get_spotify_token(self):
-        if self.access_token and time.time() < self.expires_at:
+        if self._token_valid(self.access_token, self.expires_at):
+            return self.access_token
+
+        # Single-flight: one thread refreshes. While a refresh is running, callers
+        # whose token is still within its lifetime keep using it instead of waiting.
+        if not self._token_lock.acquire(blocking=False):
+            if self._token_valid(self.access_token, self.expires_at, margin=0):
+                return self.access_token
+            self._token_lock.acquire()
+        try:
+            # Someone else may have refreshed while we waited
+            if self._token_valid(self.access_token, self.expires_at):
+                return self.access_token
+
+            if self.token_cache is None:
+                self._fetch_token()
+            else:
+                # Cross-process: first process in refreshes, the rest read its token
+                with self.token_cache.locked():
+                    cached = self.token_cache.load(self.client_id)
+                    if cached and self._token_valid(*cached):
+                        self.access_token, self.expires_at = cached
+                    else:
+                        self._fetch_token()
+                        self.token_cache.save(self.client_id, self.access_token, self.expires_at)
             return self.access_token
+        finally:
+            self._token_lock.release()
 
-        token_url = "https://accounts.spotify.com/api/token"
+    def _fetch_token(self):
+        token_url = self.TOKEN_URL
         data = {"grant_type": "client_credentials"}
-        resp = requests.post(token_url, data=data, auth=(self.client_id, self.client_secret))
+        resp = self._call(
+            lambda: self._send("POST", token_url, data=data, auth=(self.client_id, self.client_secret)),
+            token_url, method="POST", throttle=False, inst=self._instrumentation(),
+        )
 
         if resp.status_code != 200:
             raise Exception(f"Failed to get token: {resp.status_code}, {resp.text}")
 
-        token_json = resp.json()
+        token_json = loads(resp.content)
         self.access_token = token_json["access_token"]
         expires_in = token_json["expires_in"]
-        self.expires_at = time.time() + expires_in - 30
+        self.expires_at = time.time() + expires_in
 
-        return self.access_token
+    def _invalidate_token(self, token):
+        """Drop a token the API rejected (also ignored if found in the token cache)."""
+        with self._token_lock:
+            self._rejected_token = token
+            if self.access_token == token:
+                self.access_token = None
 
     def _headers(self):
         # Always ensure a fresh token
@@ -31,26 +243,64 @@ class SpotifyAPI:
         return {"Authorization": f"Bearer {token}"}
 
     def get(self, url, params=None):
-        import requests
-        resp = requests.get(url, headers=self._headers(), params=params, timeout=20)
+        inst = self._instrumentation()
+        stale = None
+        conditional = {}
+        if self.cache is not None:
+            entry = self.cache.lookup(url, params)
+            if entry is not None and entry.fresh:
+                if inst is not None:
+                    inst.request_finished({"endpoint": endpoint_template(url), "method": "GET",
+                                           "status": "cached", "bytes": 0, "latency": 0.0,
+                                           "retries": 0, "cached": True})
+                return entry.value
+            if entry is not None:
+                # Stale: ask Spotify whether it changed instead of re-downloading
+                stale = entry
+                if entry.etag:
+                    conditional["If-None-Match"] = entry.etag
+                if entry.last_modified:
+                    conditional["If-Modified-Since"] = entry.last_modified
+
+        # Throttled; 429/5xx/timeouts retried by the scheduler
+        send = lambda: self._send("GET", url, headers={**self._headers(), **conditional}, params=params)
+        resp = self._call(send, url, inst=inst)
 
         # Optional: auto-retry once on 401 (token just expired on server side)
         if resp.status_code == 401:
             # force refresh and retry
-            self.access_token = None
-            resp = requests.get(url, headers=self._headers(), params=params, timeout=20)
+            self._invalidate_token(resp.request.headers["Authorization"].split(" ", 1)[-1])
+            resp = self._call(send, url, inst=inst)
+
+        # Not modified: keep the already-parsed body, just extend its lifetime
+        if resp.status_code == 304 and stale is not None:
+            self.cache.revalidated(url, params, stale)
+            return stale.value
+
         resp.raise_for_status()
-        return resp.json()
+        if inst is None:
+            data = loads(resp.content)
+        else:
+            with inst.span("json_decode"):
+                data = loads(resp.content)
+
+        if self.cache is not None:
+            self.cache.set(url, params, data, text=resp.text,
+                           etag=resp.headers.get("ETag"),
+                           last_modified=resp.headers.get("Last-Modified"),
+                           refetched=stale is not None)
+        return data
 
 
     # Search Artists
-    # def search_artists_raw(self, query: str, limit: int = 5):
-    #     query = (query or "").strip()
-    #     if not query:
-    #         return {}
-    #     url = "https://api.spotify.com/v1/search"
-    #     params = {"q": query, "type": "artist", "limit": limit}
-    #     return self.get(url, params=params)
+    def search_artists_raw(self, query: str, limit: int = 5):
+        """Raw search JSON (used by services.find_best_artist)."""
+        query = (query or "").strip()
+        if not query:
+            return {}
+        url = f"{self.API_BASE}/search"
+        params = {"q": query, "type": "artist", "limit": int(limit)}
+        return self.get(url, params=params)
 
     def search_artists(self, query: str, limit: int = 5):
         """
@@ -73,25 +323,22 @@ class SpotifyAPI:
             return []
 
         # Build request
-        url = "https://api.spotify.com/v1/search"
+        url = f"{self.API_BASE}/search"
         params = {"q": query, "type": "artist", "limit": int(limit)}
 
         # Call Spotify (class' tokens and headers)
         data = self.get(url, params=params) or {}
 
         # Parse robustly
-        items = data.get("artists", {}).get("items", []) or []
-        results = []
-        for artist in items:
-            results.append({
-                "id": artist.get("id", ""),
-                "name": artist.get("name", ""),
-                "url": (artist.get("external_urls") or {}).get("spotify", ""),
-                "genres": artist.get("genres", []) or [],
-                "followers": int((artist.get("followers") or {}).get("total", 0)),
-                "popularity": int(artist.get("popularity", 0)),
-            })
-        return results
+        items = (data.get("artists") or {}).get("items", []) or []
+        return [parse_artist(artist) for artist in items if artist]
+
+    def search_artist_records(self, query: str, limit: int = 5, data=None):
+        """search_artists as models.Artist records (no per-result dict)."""
+        if data is None:
+            data = self.search_artists_raw(query, limit=limit) or {}
+        items = (data.get("artists") or {}).get("items", []) or []
+        return [Artist.from_json(artist) for artist in items if artist]
 
 
     # Top Tracks
@@ -100,9 +347,30 @@ class SpotifyAPI:
         if not artist_id:
             raise ValueError("artist_id is required")
 
-        url = f"https://api.spotify.com/v1/artists/{artist_id}/top-tracks"
+        url = f"{self.API_BASE}/artists/{artist_id}/top-tracks"
         # Reuse the authenticated GET helper
         data = self.get(url, params={"market": market})
         # Ensure we always return a dict with a 'tracks' key
         return data if isinstance(data, dict) else {"tracks": []}
 
+
+    # Several Artists
+    def get_artists(self, ids) -> list:
+        """
+        Fetch artist profiles for many IDs using the multi-ID /v1/artists endpoint.
+
+        IDs are sent in chunks of up to 50 per request. Returns a list of raw
+        artist dicts in the same order as `ids`; unknown IDs come back as None.
+        """
+        ids = list(ids)
+        results = [None] * len(ids)
+        # Skip blank IDs but keep their slot so output lines up with input
+        wanted = [(pos, i) for pos, i in enumerate(ids) if i]
+        for start in range(0, len(wanted), self.MAX_IDS_PER_REQUEST):
+            chunk = wanted[start:start + self.MAX_IDS_PER_REQUEST]
+            params = {"ids": ",".join(i for _, i in chunk)}
+            data = self.get(f"{self.API_BASE}/artists", params=params) or {}
+            # Spotify returns artists in request order (None for unknown IDs)
+            for (pos, _), artist in zip(chunk, data.get("artists") or []):
+                results[pos] = artist
+        return results
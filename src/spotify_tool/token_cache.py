@@ -0,0 +1,79 @@
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileTokenCache:
+    """
+    On-disk access-token cache shared by processes using the same credentials.
+
+    Tokens are stored per client ID (hashed) in a JSON file next to a lock
+    file. locked() holds an exclusive OS file lock, so only one process mints
+    a token while the others wait and then read it.
+    """
+
+    def __init__(self, path: str = ".spotify_token.json"):
+        self.path = path
+        self.lock_path = path + ".lock"
+
+    @staticmethod
+    def _key(client_id: str) -> str:
+        return hashlib.sha256(client_id.encode()).hexdigest()[:16]
+
+    @contextmanager
+    def locked(self):
+        """Exclusive cross-process lock around a read-refresh-write cycle."""
+        with open(self.lock_path, "a+b") as fh:
+            if fcntl is not None:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            else:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+                else:
+                    fh.seek(0)
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _read_all(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def load(self, client_id: str):
+        """Return (access_token, expires_at) for client_id, or None."""
+        entry = self._read_all().get(self._key(client_id))
+        if not isinstance(entry, dict) or "access_token" not in entry:
+            return None
+        return entry["access_token"], float(entry.get("expires_at", 0))
+
+    def save(self, client_id: str, access_token: str, expires_at: float):
+        """Write the token atomically (temp file + rename), readable by owner only."""
+        data = self._read_all()
+        data[self._key(client_id)] = {"access_token": access_token, "expires_at": expires_at}
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".token-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(data, fh)
+            os.chmod(tmp, 0o600)
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
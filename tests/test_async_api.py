@@ -0,0 +1,39 @@
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from mock_server import MockSpotifyServer  # noqa: E402
+from spotify_tool import services  # noqa: E402
+from spotify_tool.async_api import AsyncSpotifyAPI  # noqa: E402
+from spotify_tool.ratelimit import RequestScheduler  # noqa: E402
+
+ARTISTS = [f"{i:022d}" for i in range(32)]
+
+
+def _run(server, concurrency):
+    async def go():
+        async with AsyncSpotifyAPI("id", "secret", concurrency=concurrency,
+                                   scheduler=RequestScheduler(rate=None),
+                                   api_base=server.api_base, token_url=server.token_url) as api:
+            start = time.perf_counter()
+            frames = await services.build_top_tracks_dfs_async(api, ARTISTS)
+            return time.perf_counter() - start, frames
+
+    return asyncio.run(go())
+
+
+def test_top_tracks_async_scales_with_concurrency():
+    with MockSpotifyServer(latency_ms=20) as server:
+        serial, frames = _run(server, 1)
+        parallel, parallel_frames = _run(server, 8)
+        assert server.counts["token"] == 2  # one per client, not one per request
+
+    assert list(frames) == list(parallel_frames) == ARTISTS
+    assert all(not df.empty for df in parallel_frames.values())
+    # 32 requests x 20 ms: ~0.64 s one at a time, ~0.08 s eight at a time
+    assert parallel < serial / 3, (serial, parallel)
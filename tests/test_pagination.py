@@ -0,0 +1,55 @@
+import os
+import sys
+import threading
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from spotify_tool.pagination import iter_artist_albums, iter_items  # noqa: E402
+
+
+class FakePagedAPI:
+    """Serves `total` albums in offset/limit pages and counts GETs."""
+
+    API_BASE = "https://api.test/v1"
+
+    def __init__(self, total):
+        self.total = total
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None):
+        with self._lock:
+            self.calls += 1
+        query = {k: v[0] for k, v in parse_qs(urlparse(url).query).items()}
+        query.update(params or {})
+        offset, limit = int(query.get("offset", 0)), int(query.get("limit", 20))
+        end = min(offset + limit, self.total)
+        base = url.split("?")[0]
+        return {
+            "items": [{"id": f"al{i}", "artists": [{"id": "x"}]} for i in range(offset, end)],
+            "next": f"{base}?offset={end}&limit={limit}" if end < self.total else None,
+        }
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+@pytest.mark.parametrize("total, max_items, calls", [
+    (120, 50, 1),    # limit lands on a page boundary: no request for page 2
+    (120, 60, 2),
+    (120, 100, 2),
+    (120, None, 3),
+    (30, 50, 1),     # fewer items than the limit
+])
+def test_max_items_stops_requesting_pages(prefetch, total, max_items, calls):
+    api = FakePagedAPI(total)
+    albums = list(iter_artist_albums(api, "artist", page_size=50, max_items=max_items, prefetch=prefetch))
+    assert len(albums) == min(total, max_items or total)
+    assert api.calls == calls
+
+
+def test_zero_max_items_makes_no_request():
+    api = FakePagedAPI(10)
+    assert list(iter_items(api, f"{api.API_BASE}/artists/a/albums", max_items=0)) == []
+    assert api.calls == 0